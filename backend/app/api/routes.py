@@ -4,6 +4,7 @@ API Routes for Sahtein 3.0
 
 import logging
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.schemas import ChatRequest, ChatResponseAPI
 
@@ -28,8 +29,10 @@ async def chat(request: ChatRequest):
 
         pipeline = get_pipeline()
 
-        # Process message through pipeline
-        response = pipeline.process(request.message, debug=request.debug)
+        # Process message through pipeline (CPU-bound, keep it off the event loop)
+        response = await run_in_threadpool(
+            pipeline.process, request.message, debug=request.debug
+        )
 
         # Convert to API response
         return ChatResponseAPI(
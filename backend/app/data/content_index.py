@@ -3,18 +3,37 @@ Content Index for RAG Retrieval
 Implements BM25/TF-IDF based lexical search over recipe content
 """
 
+import heapq
 import logging
+import threading
+from collections import OrderedDict
 from typing import Literal
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
+from app.models.config import settings
 from app.models.schemas import ContentDocument, RecipeArticle, StructuredRecipe
 from app.data.normalizers import normalize_text, create_searchable_text
 
 logger = logging.getLogger(__name__)
 
 
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Indices of the top_k highest scores, best first, ties in index order
+
+    Partial selection with np.partition, then a stable sort of only the selected
+    scores. Everything tied with the k-th score is kept before sorting, so the
+    result does not depend on which tied entries partition happened to pick.
+    """
+    if len(scores) > top_k > 0:
+        kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        selected = np.flatnonzero(scores >= kth_score)
+    else:
+        selected = np.arange(len(scores))
+    return selected[np.argsort(-scores[selected], kind="stable")][:max(top_k, 0)]
+
+
 class ContentIndex:
     """
     Content index for RAG retrieval
@@ -25,8 +44,15 @@ class ContentIndex:
         self.documents: list[ContentDocument] = []
         self.vectorizer: TfidfVectorizer | None = None
         self.doc_vectors: np.ndarray | None = None
+        self._docs_by_source: dict[str, np.ndarray] = {}
+        self._vectors_by_source: dict = {}
         self._is_built = False
 
+        # LRU cache of query vectors keyed by normalized query
+        self._query_vectors: OrderedDict = OrderedDict()
+        self._query_vectors_size = settings.query_vector_cache_size
+        self._query_vectors_lock = threading.Lock()
+
     def add_olj_articles(self, articles: list[RecipeArticle]):
         """Add OLJ articles to the index"""
         logger.info(f"Adding {len(articles)} OLJ articles to content index")
@@ -47,6 +73,7 @@ class ContentIndex:
                 doc_id=f"olj_{article.article_id}",
                 source="olj",
                 content=content,
+                article_id=article.article_id,
                 metadata={
                     "article_id": article.article_id,
                     "title": article.title,
@@ -81,6 +108,8 @@ class ContentIndex:
                 doc_id=f"base2_{recipe.recipe_id}",
                 source="base2",
                 content=content,
+                recipe_id=recipe.recipe_id,
+                ingredient_set=frozenset(normalize_text(ing.nom) for ing in recipe.ingredients),
                 metadata={
                     "recipe_id": recipe.recipe_id,
                     "name": recipe.name,
@@ -100,6 +129,11 @@ class ContentIndex:
 
         logger.info(f"Building content index with {len(self.documents)} documents")
 
+        # Precompute lowercased text once so queries never re-lowercase it
+        for doc in self.documents:
+            doc.content_lower = doc.content.lower()
+            doc.metadata_lower = str(doc.metadata).lower()
+
         # Extract all content texts
         contents = [doc.content for doc in self.documents]
 
@@ -110,9 +144,22 @@ class ContentIndex:
             min_df=1,
             max_df=0.8,
             sublinear_tf=True,
+            norm="l2",  # Unit rows: search() relies on this to use dot products
+            dtype=np.float32,  # Half the bytes of float64 per stored weight
         )
 
         self.doc_vectors = self.vectorizer.fit_transform(contents)
+
+        # Row indices and vector subsets per source, so filtered searches only score eligible docs
+        sources = np.array([doc.source for doc in self.documents])
+        for source in ("olj", "base2"):
+            rows = np.flatnonzero(sources == source)
+            self._docs_by_source[source] = rows
+            self._vectors_by_source[source] = self.doc_vectors[rows]
+
+        # Vectors from a previous vocabulary are stale
+        self.clear_query_cache()
+
         self._is_built = True
 
         logger.info("Content index built successfully")
@@ -136,30 +183,48 @@ class ContentIndex:
         normalized_query = normalize_text(query)
 
         # Vectorize query
-        query_vector = self.vectorizer.transform([normalized_query])
+        query_vector = self._vectorize_query(normalized_query)
 
-        # Calculate similarities
-        similarities = cosine_similarity(query_vector, self.doc_vectors).flatten()
+        # Only score documents from the requested source
+        if source_filter == "all":
+            rows = None
+            doc_vectors = self.doc_vectors
+        else:
+            rows = self._docs_by_source[source_filter]
+            doc_vectors = self._vectors_by_source[source_filter]
 
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1]
+        # Cosine similarity: TF-IDF rows are L2-normalized, so a sparse dot product suffices
+        similarities = (doc_vectors @ query_vector.T).toarray().ravel()
 
-        # Filter by source if requested
         results = []
-        for idx in top_indices:
-            doc = self.documents[idx]
-            score = similarities[idx]
+        for idx in top_k_indices(similarities, top_k):
+            doc_idx = idx if rows is None else rows[idx]
+            results.append((self.documents[doc_idx], float(similarities[idx])))
 
-            # Apply source filter
-            if source_filter != "all" and doc.source != source_filter:
-                continue
+        return results
 
-            results.append((doc, float(score)))
+    def clear_query_cache(self) -> None:
+        """Drop all memoized query vectors"""
+        with self._query_vectors_lock:
+            self._query_vectors.clear()
 
-            if len(results) >= top_k:
-                break
+    def _vectorize_query(self, normalized_query: str):
+        """TF-IDF vector for a normalized query, memoized in a bounded LRU"""
+        with self._query_vectors_lock:
+            query_vector = self._query_vectors.get(normalized_query)
+            if query_vector is not None:
+                self._query_vectors.move_to_end(normalized_query)
+                return query_vector
 
-        return results
+        query_vector = self.vectorizer.transform([normalized_query])
+
+        if self._query_vectors_size > 0:
+            with self._query_vectors_lock:
+                self._query_vectors[normalized_query] = query_vector
+                if len(self._query_vectors) > self._query_vectors_size:
+                    self._query_vectors.popitem(last=False)
+
+        return query_vector
 
     def search_by_ingredients(
         self,
@@ -195,16 +260,18 @@ class ContentIndex:
                 doc_ingredients=doc_ingredients,
             )
 
+            # A recipe sharing none of the ingredients is only lexical noise
+            if not matches:
+                continue
+
             # Boost score based on match ratio
             # Higher weight on ingredient matches for ingredient-based queries
             final_score = base_score * 0.3 + match_ratio * 0.7
 
             rescored_results.append((doc, final_score))
 
-        # Re-sort by final score
-        rescored_results.sort(key=lambda x: x[1], reverse=True)
-
-        return rescored_results[:top_k]
+        # Keep top-k by final score
+        return heapq.nlargest(top_k, rescored_results, key=lambda x: x[1])
 
     def get_document_by_id(self, doc_id: str) -> ContentDocument | None:
         """Get a document by ID"""
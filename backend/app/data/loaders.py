@@ -22,9 +22,23 @@ from app.data.normalizers import (
     extract_slug_from_url,
 )
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library parser
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _read_json(path: Path) -> Any:
+    """Parse a UTF-8 JSON file, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 # ============================================================================
 # Base 1 - OLJ Recipe Articles
 # ============================================================================
@@ -33,8 +47,7 @@ def load_olj_articles() -> list[RecipeArticle]:
     """Load OLJ recipe articles from Base 1"""
     logger.info(f"Loading OLJ articles from {settings.olj_recipes_path}")
 
-    with open(settings.olj_recipes_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_json(settings.olj_recipes_path)
 
     articles: list[RecipeArticle] = []
 
@@ -182,8 +195,7 @@ def load_structured_recipes() -> list[StructuredRecipe]:
     """Load structured recipes from Base 2"""
     logger.info(f"Loading structured recipes from {settings.base2_recipes_path}")
 
-    with open(settings.base2_recipes_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_json(settings.base2_recipes_path)
 
     recipes: list[StructuredRecipe] = []
     recipe_id_counter = 1
@@ -242,8 +254,7 @@ def load_golden_examples() -> list[GoldenExample]:
     """Load golden examples from test dataset"""
     logger.info(f"Loading golden examples from {settings.golden_examples_path}")
 
-    with open(settings.golden_examples_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_json(settings.golden_examples_path)
 
     examples: list[GoldenExample] = []
 
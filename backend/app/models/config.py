@@ -45,6 +45,8 @@ class Settings(BaseSettings):
     retrieval_top_k: int = 10
     rerank_top_k: int = 3
     min_similarity_threshold: float = 0.3
+    retrieval_cache_size: int = 256  # LRU entries of retrieval results, 0 disables
+    query_vector_cache_size: int = 1024  # LRU entries of TF-IDF query vectors, 0 disables
 
     # Content guard settings
     max_response_words: int = 150  # ~100 words target, allow buffer
@@ -31,6 +31,20 @@ class LLMClient(ABC):
 class MockLLMClient(LLMClient):
     """Mock LLM client for testing and development"""
 
+    # Canned responses, serialized once
+    CLASSIFICATION_RESPONSE = json.dumps({
+        "intent": "food_request",
+        "language": "fr",
+        "slots": {
+            "dishes": [],
+            "ingredients": [],
+            "methods": [],
+            "occasions": []
+        }
+    })
+    JSON_RESPONSE = json.dumps({"response": "Mock JSON response"})
+    TEXT_RESPONSE = "Mock text response from LLM"
+
     def chat_completion(
         self,
         messages: list[dict[str, str]],
@@ -43,22 +57,13 @@ class MockLLMClient(LLMClient):
 
         # Mock classification responses
         if "classify" in last_message or "intent" in last_message:
-            return json.dumps({
-                "intent": "food_request",
-                "language": "fr",
-                "slots": {
-                    "dishes": [],
-                    "ingredients": [],
-                    "methods": [],
-                    "occasions": []
-                }
-            })
+            return self.CLASSIFICATION_RESPONSE
 
         # Mock general responses
         if response_format == "json_object":
-            return json.dumps({"response": "Mock JSON response"})
+            return self.JSON_RESPONSE
 
-        return "Mock text response from LLM"
+        return self.TEXT_RESPONSE
 
 
 class OpenAIClient(LLMClient):
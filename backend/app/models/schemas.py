@@ -3,6 +3,7 @@ Pydantic schemas for Sahtein 3.0
 All data models used throughout the application
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal
 from pydantic import BaseModel, Field, HttpUrl, ConfigDict
@@ -136,19 +137,33 @@ class QueryPlan(BaseModel):
     link_query: str | None = None
 
 
-class RetrievalCandidate(BaseModel):
-    """A single retrieval candidate"""
+@dataclass(slots=True, frozen=True)
+class RetrievalCandidate:
+    """A single retrieval candidate (immutable, rescoring returns a copy)"""
 
     source: Literal["olj", "base2"]
     content: str
     score: float
-    metadata: dict = Field(default_factory=dict)
+    metadata: dict = field(default_factory=dict)
 
     # For OLJ candidates
     article_id: str | None = None
 
     # For Base 2 candidates
     recipe_id: str | None = None
+    ingredient_set: frozenset[str] = frozenset()  # Normalized ingredient names
+
+    # Lowercased content/metadata, precomputed at index build time
+    content_lower: str | None = None
+    metadata_lower: str | None = None
+
+    # Raw retrieval similarity when `score` is a fused rank score (None: `score` is the similarity)
+    raw_score: float | None = None
+
+    @property
+    def relevance(self) -> float:
+        """Retrieval similarity, for absolute thresholds (fused scores only order candidates)"""
+        return self.raw_score if self.raw_score is not None else self.score
 
 
 class LinkResolutionResult(BaseModel):
@@ -161,7 +176,9 @@ class LinkResolutionResult(BaseModel):
 
 
 class ScenarioContext(BaseModel):
-    """Context for scenario selection"""
+    """Context for scenario selection (immutable, shared across requests)"""
+
+    model_config = ConfigDict(frozen=True)
 
     scenario_id: int
     scenario_name: str
@@ -214,6 +231,17 @@ class ContentDocument(BaseModel):
     content: str
     metadata: dict = Field(default_factory=dict)
 
+    # Source IDs, lifted out of metadata for direct access
+    article_id: str | None = None
+    recipe_id: str | None = None
+
+    # Normalized ingredient names (Base 2), kept out of metadata so it never gets stringified
+    ingredient_set: frozenset[str] = frozenset()
+
+    # Lowercased content/metadata, filled in by ContentIndex.build()
+    content_lower: str = ""
+    metadata_lower: str = ""
+
 
 class LinkDocument(BaseModel):
     """Document in link index (article-level only)"""
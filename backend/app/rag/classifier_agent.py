@@ -16,6 +16,49 @@ from app.data.normalizers import normalize_text
 logger = logging.getLogger(__name__)
 
 
+def _compile_any(patterns: list[str]) -> re.Pattern:
+    """Compile a list of regex patterns into a single alternation"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+# Rule-based intent patterns, compiled once at import.
+# Order matters: the first matching intent wins.
+_INTENT_PATTERNS: dict[str, re.Pattern] = {
+    # 1. Greeting
+    "greeting": _compile_any([
+        r"^(bonjour|salut|hello|hi|hey|coucou)",
+        r"^(bonsoir|bonne journée)",
+    ]),
+    # 2. Farewell
+    "farewell": _compile_any([
+        r"^(au revoir|bye|adieu|à bientôt|merci et au revoir)",
+        r"(au revoir|bye|adieu)$",
+    ]),
+    # 3. About bot
+    "about_bot": _compile_any([
+        r"(qui es-tu|qu'est-ce que tu es|tu es qui|c'est quoi)",
+        r"(comment tu t'appelles|ton nom|qui êtes-vous)",
+        r"(qu'est-ce que sahtein|c'est quoi sahtein)",
+        r"(tu peux faire quoi|que peux-tu faire)",
+    ]),
+    # 4. Anti-injection / jailbreak attempts
+    "anti_injection": _compile_any([
+        r"(ignore|oublie|forget) (les |tes )?(instructions|directives|règles)",
+        r"(tu es|you are) (maintenant|now) (un|a) (autre|different)",
+        r"(répète|repeat|affiche|show) (ton|your) (prompt|system)",
+        r"</s>|<\|im_end\|>|<\|endoftext\|>",
+    ]),
+    # 5. Food request
+    "food_request": _compile_any([
+        r"recette",
+        r"(comment|je veux) (faire|préparer|cuisiner)",
+        r"(j'ai|j ai|avec) (du|de la|des|le|la|les) .*(que puis-je|quoi faire|idée)",
+        r"(mezze|plat|dessert|soupe|salade)",
+        r"(taboulé|hummus|kebbeh|kafta|baklava)",  # Common dishes
+    ]),
+}
+
+
 class ClassifierAgent:
     """
     Enhanced classifier for Sahtein chatbot
@@ -76,6 +119,10 @@ class ClassifierAgent:
             slots=slots,
         )
 
+    def classify_batch(self, queries: list[str]) -> list[ClassificationResult]:
+        """Classify several queries, in order"""
+        return [self.classify(query) for query in queries]
+
     def _detect_language(self, query: str) -> str:
         """Detect if query is in French or not"""
         # French indicators
@@ -115,57 +162,10 @@ class ClassifierAgent:
     def _detect_intent_rules(self, query_lower: str, normalized: str) -> str:
         """Rule-based intent detection"""
 
-        # 1. Greeting
-        greeting_patterns = [
-            r"^(bonjour|salut|hello|hi|hey|coucou)",
-            r"^(bonsoir|bonne journée)",
-        ]
-        for pattern in greeting_patterns:
-            if re.search(pattern, query_lower):
-                return "greeting"
-
-        # 2. Farewell
-        farewell_patterns = [
-            r"^(au revoir|bye|adieu|à bientôt|merci et au revoir)",
-            r"(au revoir|bye|adieu)$",
-        ]
-        for pattern in farewell_patterns:
-            if re.search(pattern, query_lower):
-                return "farewell"
-
-        # 3. About bot
-        about_patterns = [
-            r"(qui es-tu|qu'est-ce que tu es|tu es qui|c'est quoi)",
-            r"(comment tu t'appelles|ton nom|qui êtes-vous)",
-            r"(qu'est-ce que sahtein|c'est quoi sahtein)",
-            r"(tu peux faire quoi|que peux-tu faire)",
-        ]
-        for pattern in about_patterns:
-            if re.search(pattern, query_lower):
-                return "about_bot"
-
-        # 4. Anti-injection / jailbreak attempts
-        injection_patterns = [
-            r"(ignore|oublie|forget) (les |tes )?(instructions|directives|règles)",
-            r"(tu es|you are) (maintenant|now) (un|a) (autre|different)",
-            r"(répète|repeat|affiche|show) (ton|your) (prompt|system)",
-            r"</s>|<\|im_end\|>|<\|endoftext\|>",
-        ]
-        for pattern in injection_patterns:
-            if re.search(pattern, query_lower):
-                return "anti_injection"
-
-        # 5. Food request
-        food_patterns = [
-            r"recette",
-            r"(comment|je veux) (faire|préparer|cuisiner)",
-            r"(j'ai|j ai|avec) (du|de la|des|le|la|les) .*(que puis-je|quoi faire|idée)",
-            r"(mezze|plat|dessert|soupe|salade)",
-            r"(taboulé|hummus|kebbeh|kafta|baklava)",  # Common dishes
-        ]
-        for pattern in food_patterns:
-            if re.search(pattern, query_lower):
-                return "food_request"
+        # Rules are checked in priority order (greeting before food, etc.)
+        for intent, pattern in _INTENT_PATTERNS.items():
+            if pattern.search(query_lower):
+                return intent
 
         # Check culinary graph
         if culinary_graph.find_dish(normalized):
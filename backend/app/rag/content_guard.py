@@ -49,11 +49,61 @@ class ContentGuard:
     # Flag emojis to reject
     FLAG_PATTERN = re.compile(r'[\U0001F1E6-\U0001F1FF]{2}')  # Flag emojis
 
+    # Emoji ranges
+    EMOJI_PATTERN = re.compile(
+        "["
+        "\U0001F600-\U0001F64F"  # emoticons
+        "\U0001F300-\U0001F5FF"  # symbols & pictographs
+        "\U0001F680-\U0001F6FF"  # transport & map
+        "\U0001F1E0-\U0001F1FF"  # flags
+        "\U00002702-\U000027B0"
+        "\U000024C2-\U0001F251"
+        "]+",
+        flags=re.UNICODE
+    )
+
     # Non-French word patterns (common English words that shouldn't appear)
     NON_FRENCH_PATTERNS = [
         r'\bthe\b', r'\band\b', r'\bor\b', r'\bwith\b', r'\bfor\b',
         r'\brecipe\b', r'\bcooking\b', r'\bingredients?\b',
     ]
+    NON_FRENCH_PATTERN = re.compile('|'.join(NON_FRENCH_PATTERNS), re.IGNORECASE)
+
+    # French stopwords; any one of them as a whole word marks the text as French
+    FRENCH_STOPWORDS = frozenset([
+        'le', 'la', 'les', 'l', 'de', 'du', 'des', 'd', 'une', 'un',
+        'et', 'à', 'en', 'pour', 'avec', 'voici', 'bonjour',
+    ])
+
+    # Punctuation (apostrophes included, so "l'agneau" gives "l" and "agneau") becomes spaces
+    WORD_SEPARATORS = str.maketrans({char: ' ' for char in ".,;:!?()[]<>\"'’/"})
+
+    # Patterns that indicate ingredient lists
+    INGREDIENT_LIST_PATTERNS = (
+        re.compile(r'ingrédients?\s*:'),
+        re.compile(r'\d+\s*(g|ml|c\.\s*à\s*(soupe|café))'),  # Quantities
+        re.compile(r'^\s*[\d•\-]\s*\d+.*?(grammes?|litres?)', re.MULTILINE),  # List items with quantities
+    )
+
+    # Patterns for cooking steps
+    STEPS_LIST_PATTERNS = (
+        re.compile(r'(préparation|étapes?)\s*:', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'^\s*\d+\.\s*(faire|mettre|ajouter|mélanger|cuire)', re.MULTILINE | re.IGNORECASE),  # Numbered steps
+    )
+
+    # Common Markdown patterns
+    MARKDOWN_PATTERNS = (
+        re.compile(r'\*\*[^*]+\*\*'),  # **bold**
+        re.compile(r'\*[^*]+\*'),  # *italic*
+        re.compile(r'^\s*#\s+', re.MULTILINE),  # # Headers
+        re.compile(r'^\s*-\s+', re.MULTILINE),  # - List items (at line start)
+        re.compile(r'^\s*\d+\.\s+', re.MULTILINE),  # 1. Numbered items
+        re.compile(r'\[([^\]]+)\]\(([^)]+)\)'),  # [text](url)
+    )
+
+    TAG_PATTERN = re.compile(r'<[^>]+>')
+    URL_PATTERN = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
+    LINK_PATTERN = re.compile(r'<a\s+[^>]*href=')
 
     def __init__(self):
         pass
@@ -66,15 +116,19 @@ class ContentGuard:
         """
         result = ValidationResult()
 
+        # Strip tags once; the text checks below all run on the visible text
+        text = self.TAG_PATTERN.sub('', html)
+        text_lower = text.lower()
+
         # 1. Check language (should be mostly French)
-        if not self._is_french(html):
+        if not self._is_french(text_lower):
             result.add_warning("Response may not be in French")
 
         # 2. For OLJ scenarios, check NO ingredient lists/steps
         if scenario.scenario_id == 1 and not scenario.show_full_recipe:
-            if self._contains_ingredient_list(html):
+            if self._contains_ingredient_list(text_lower):
                 result.add_error("OLJ scenario must not contain ingredient lists")
-            if self._contains_steps_list(html):
+            if self._contains_steps_list(text_lower):
                 result.add_error("OLJ scenario must not contain cooking steps")
 
         # 3. Check URLs are from allowed domain
@@ -82,7 +136,7 @@ class ContentGuard:
             result.add_error(f"Found URLs outside allowed domain: {settings.allowed_url_domain}")
 
         # 4. Check HTML format (no Markdown)
-        if self._contains_markdown(html):
+        if self._contains_markdown(text):
             result.add_warning("Response contains Markdown formatting, should be HTML only")
 
         # 5. Check emoji count
@@ -131,95 +185,44 @@ class ContentGuard:
 
         return sanitized
 
-    def _is_french(self, text: str) -> bool:
-        """Check if text appears to be in French"""
-        # Remove HTML tags for analysis
-        clean_text = re.sub(r'<[^>]+>', '', text).lower()
-
+    def _is_french(self, text_lower: str) -> bool:
+        """Check if lowercased, tag-free text appears to be in French"""
         # Check for non-French patterns
-        for pattern in self.NON_FRENCH_PATTERNS:
-            if re.search(pattern, clean_text, re.IGNORECASE):
-                return False
-
-        # French word indicators
-        french_indicators = ['le', 'la', 'les', 'de', 'du', 'des', 'une', 'un', 'pour', 'avec']
-        has_french = any(word in clean_text for word in french_indicators)
-
-        return has_french
-
-    def _contains_ingredient_list(self, html: str) -> bool:
-        """Check if HTML contains what looks like an ingredient list"""
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', html).lower()
-
-        # Patterns that indicate ingredient lists
-        patterns = [
-            r'ingrédients?\s*:',
-            r'\d+\s*(g|ml|c\.\s*à\s*(soupe|café))',  # Quantities
-            r'^\s*[\d•\-]\s*\d+.*?(grammes?|litres?)',  # List items with quantities
-        ]
+        if self.NON_FRENCH_PATTERN.search(text_lower):
+            return False
 
-        return any(re.search(pattern, text, re.MULTILINE) for pattern in patterns)
+        # Look for whole French stopwords, not substrings ("la" in "salad")
+        tokens = text_lower.translate(self.WORD_SEPARATORS).split()
+        return not self.FRENCH_STOPWORDS.isdisjoint(tokens)
 
-    def _contains_steps_list(self, html: str) -> bool:
-        """Check if HTML contains what looks like cooking steps"""
-        text = re.sub(r'<[^>]+>', '', html).lower()
+    def _contains_ingredient_list(self, text_lower: str) -> bool:
+        """Check if lowercased, tag-free text looks like an ingredient list"""
+        return any(pattern.search(text_lower) for pattern in self.INGREDIENT_LIST_PATTERNS)
 
-        # Patterns for cooking steps
-        patterns = [
-            r'(préparation|étapes?)\s*:',
-            r'^\s*\d+\.\s*(faire|mettre|ajouter|mélanger|cuire)',  # Numbered steps
-        ]
-
-        return any(re.search(pattern, text, re.MULTILINE | re.IGNORECASE) for pattern in patterns)
+    def _contains_steps_list(self, text_lower: str) -> bool:
+        """Check if lowercased, tag-free text looks like cooking steps"""
+        return any(pattern.search(text_lower) for pattern in self.STEPS_LIST_PATTERNS)
 
     def _all_urls_valid(self, html: str) -> bool:
         """Check all URLs are from allowed domain"""
         # Extract all URLs
-        url_pattern = r'https?://[^\s<>"]+|www\.[^\s<>"]+'
-        urls = re.findall(url_pattern, html)
+        urls = self.URL_PATTERN.findall(html)
+        allowed = settings.allowed_url_domain
 
         for url in urls:
-            if not url.startswith(settings.allowed_url_domain):
+            if not url.startswith(allowed):
                 logger.warning(f"Invalid URL domain: {url}")
                 return False
 
         return True
 
-    def _contains_markdown(self, html: str) -> bool:
-        """Check if response contains Markdown instead of HTML"""
-        # Common Markdown patterns
-        markdown_patterns = [
-            r'\*\*[^*]+\*\*',  # **bold**
-            r'\*[^*]+\*',  # *italic*
-            r'^\s*#\s+',  # # Headers
-            r'^\s*-\s+',  # - List items (at line start)
-            r'^\s*\d+\.\s+',  # 1. Numbered items
-            r'\[([^\]]+)\]\(([^)]+)\)',  # [text](url)
-        ]
-
-        # But ignore cases where these are inside HTML tags
-        text_without_tags = re.sub(r'<[^>]+>', '', html)
-
-        return any(re.search(pattern, text_without_tags, re.MULTILINE) for pattern in markdown_patterns)
+    def _contains_markdown(self, text: str) -> bool:
+        """Check if tag-free text contains Markdown instead of HTML"""
+        return any(pattern.search(text) for pattern in self.MARKDOWN_PATTERNS)
 
     def _count_emojis(self, text: str) -> int:
         """Count emojis in text"""
-        # Emoji ranges
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map
-            "\U0001F1E0-\U0001F1FF"  # flags
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "]+",
-            flags=re.UNICODE
-        )
-
-        matches = emoji_pattern.findall(text)
-        return len(matches)
+        return sum(1 for _ in self.EMOJI_PATTERN.finditer(text))
 
     def _contains_flags(self, text: str) -> bool:
         """Check if text contains flag emojis"""
@@ -228,42 +231,22 @@ class ContentGuard:
     def _count_words(self, html: str) -> int:
         """Count words in HTML (excluding tags)"""
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', html)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        # Count words
-        words = text.split()
-        return len(words)
+        text = self.TAG_PATTERN.sub(' ', html)
+        # Count words (split() already ignores extra whitespace)
+        return len(text.split())
 
     def _contains_link(self, html: str) -> bool:
         """Check if HTML contains at least one link"""
-        return bool(re.search(r'<a\s+[^>]*href=', html))
+        return bool(self.LINK_PATTERN.search(html))
 
     def _limit_emojis(self, text: str, max_emojis: int) -> str:
         """Remove excess emojis"""
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"
-            "\U0001F300-\U0001F5FF"
-            "\U0001F680-\U0001F6FF"
-            "\U0001F1E0-\U0001F1FF"
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "]+",
-            flags=re.UNICODE
-        )
-
-        emojis = emoji_pattern.findall(text)
-        if len(emojis) <= max_emojis:
+        excess = self._count_emojis(text) - max_emojis
+        if excess <= 0:
             return text
 
-        # Remove excess emojis from the end
-        result = text
-        for i in range(len(emojis) - max_emojis):
-            # Remove last emoji
-            result = emoji_pattern.sub('', result, count=1)
-
-        return result
+        # Drop the first `excess` emoji runs in a single pass
+        return self.EMOJI_PATTERN.sub('', text, count=excess)
 
     def _trim_to_length(self, html: str, max_words: int) -> str:
         """Trim HTML to maximum word count"""
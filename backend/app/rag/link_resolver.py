@@ -157,7 +157,7 @@ class LinkResolver:
                         primary_article=article,
                         suggested_articles=self._get_related_articles(article, count=2),
                         strategy="from_retrieval",
-                        confidence=candidate.score,
+                        confidence=candidate.relevance,
                     )
 
         # No OLJ candidate found
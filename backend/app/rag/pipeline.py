@@ -110,9 +110,13 @@ class RAGPipeline:
                     "link_query": query_plan.link_query,
                 }
 
-            # Step 3: Retrieve content (if needed)
+            # Step 3: Retrieve content (if needed).
+            # Non-French queries always get the scenario 7 decline, which uses no content.
             retrieval_candidates = None
-            if query_plan.need_type not in ["greeting", "about_bot", "off_topic"]:
+            if (
+                query_plan.need_type not in ["greeting", "about_bot", "off_topic"]
+                and classification.language != "non_fr"
+            ):
                 logger.debug("Step 3: Retrieving content...")
                 retrieval_candidates = self.retriever.retrieve(
                     query_plan, top_k=settings.retrieval_top_k
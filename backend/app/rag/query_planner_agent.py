@@ -4,6 +4,7 @@ Converts classification results into structured retrieval plans
 """
 
 import logging
+from itertools import chain
 from typing import Literal
 
 from app.models.schemas import ClassificationResult, QueryPlan
@@ -23,6 +24,15 @@ class QueryPlannerAgent:
     - link_query: query for article resolution
     """
 
+    # Non-food intents map directly to a need_type
+    _INTENT_NEED_TYPE = {
+        "greeting": "greeting",
+        "farewell": "greeting",  # Treat farewell same as greeting for now
+        "about_bot": "about_bot",
+        "off_topic": "off_topic",
+        "anti_injection": "off_topic",  # Treat injection attempts as off-topic
+    }
+
     def plan(self, classification: ClassificationResult, original_query: str) -> QueryPlan:
         """Create a query plan from classification result"""
 
@@ -83,16 +93,9 @@ class QueryPlannerAgent:
         """Determine what type of response is needed"""
 
         # Non-food intents
-        if intent == "greeting":
-            return "greeting"
-        elif intent == "farewell":
-            return "greeting"  # Treat farewell same as greeting for now
-        elif intent == "about_bot":
-            return "about_bot"
-        elif intent == "off_topic":
-            return "off_topic"
-        elif intent == "anti_injection":
-            return "off_topic"  # Treat injection attempts as off-topic
+        need_type = self._INTENT_NEED_TYPE.get(intent)
+        if need_type:
+            return need_type
 
         # Food requests
         if dishes:
@@ -118,19 +121,8 @@ class QueryPlannerAgent:
 
         Combines dishes, ingredients, and constraints into a search-optimized query
         """
-        query_parts = []
-
-        # Add dishes (highest priority)
-        if dishes:
-            query_parts.extend(dishes)
-
-        # Add ingredients
-        if ingredients:
-            query_parts.extend(ingredients)
-
-        # Add methods and occasions
-        query_parts.extend(methods)
-        query_parts.extend(occasions)
+        # Dishes first (highest priority), then ingredients, methods and occasions
+        query_parts = list(chain(dishes, ingredients, methods, occasions))
 
         # If we have extracted terms, use them
         if query_parts:
@@ -3,16 +3,30 @@ Reranker
 Refines retrieval results using heuristic scoring and optional LLM re-ranking
 """
 
+import heapq
 import logging
-from typing import Literal
+from collections.abc import Iterable
+from dataclasses import replace
+from typing import Literal, NamedTuple
+
+import numpy as np
 
 from app.models.schemas import RetrievalCandidate, QueryPlan
+from app.data.content_index import top_k_indices
 from app.data.normalizers import normalize_text
 from app.models.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class _QueryTerms(NamedTuple):
+    """Query-side terms, normalized once per rerank call"""
+
+    primary_dish: str | None
+    ingredients: tuple[str, ...]
+    constraints: tuple[str, ...]
+
+
 class Reranker:
     """
     Reranks retrieval candidates using multiple signals
@@ -42,7 +56,8 @@ class Reranker:
         """
         Rerank candidates and return top-k
 
-        Applies heuristic scoring based on query type and constraints
+        Applies heuristic scoring based on query type and constraints.
+        Duplicates collapse to their best-scoring copy, same rule as deduplicate().
         """
         if not candidates:
             return []
@@ -50,20 +65,38 @@ class Reranker:
         if top_k is None:
             top_k = settings.rerank_top_k
 
-        # Calculate final scores
-        reranked = []
-        for candidate in candidates:
-            final_score = self._calculate_final_score(candidate, query_plan)
-            candidate.score = final_score
-            reranked.append(candidate)
-
-        # Sort by final score
-        reranked.sort(key=lambda c: c.score, reverse=True)
-
-        return reranked[:top_k]
-
-    def _calculate_final_score(self, candidate: RetrievalCandidate, query_plan: QueryPlan) -> float:
+        # Normalize the query side once for the whole batch
+        terms = self._query_terms(query_plan)
+
+        # Calculate final scores, then keep the best copy of each duplicate
+        reranked = self._keep_best(
+            replace(candidate, score=self._calculate_final_score(candidate, query_plan, terms))
+            for candidate in candidates
+        )
+
+        # Select top-k by final score without sorting everything
+        scores = np.fromiter((c.score for c in reranked), dtype=float, count=len(reranked))
+        return [reranked[i] for i in top_k_indices(scores, top_k)]
+
+    @staticmethod
+    def _query_terms(query_plan: QueryPlan) -> _QueryTerms:
+        """Normalize the query plan's dish, ingredients and constraints"""
+        return _QueryTerms(
+            primary_dish=normalize_text(query_plan.primary_dish) if query_plan.primary_dish else None,
+            ingredients=tuple(normalize_text(ingredient) for ingredient in query_plan.ingredients),
+            constraints=tuple(normalize_text(constraint) for constraint in query_plan.constraints),
+        )
+
+    def _calculate_final_score(
+        self,
+        candidate: RetrievalCandidate,
+        query_plan: QueryPlan,
+        terms: _QueryTerms | None = None,
+    ) -> float:
         """Calculate final score for a candidate"""
+        if terms is None:
+            terms = self._query_terms(query_plan)
+
         # Start with base retrieval score
         score = candidate.score
 
@@ -90,21 +123,24 @@ class Reranker:
             score *= 1.1
 
         # Factor 2: Ingredient match (20% boost for ingredient queries)
-        if query_plan.need_type == "recipe_by_ingredients" and query_plan.ingredients:
-            ingredient_match_score = self._calculate_ingredient_match(
-                candidate, query_plan.ingredients
-            )
+        if query_plan.need_type == "recipe_by_ingredients" and terms.ingredients:
+            ingredient_match_score = self._ingredient_match(candidate, terms.ingredients)
             score *= (1.0 + ingredient_match_score * 0.2)
 
+        # Factors 3 and 4 both scan the normalized content: normalize it once
+        if terms.primary_dish is None and not terms.constraints:
+            return score
+        normalized_content = normalize_text(candidate.content)
+
         # Factor 3: Primary dish match (30% boost)
-        if query_plan.primary_dish:
-            if self._matches_primary_dish(candidate, query_plan.primary_dish):
+        if terms.primary_dish is not None:
+            if self._matches_primary_dish(candidate, terms.primary_dish, normalized_content):
                 score *= 1.3
 
         # Factor 4: Constraint satisfaction (15% boost per constraint)
-        if query_plan.constraints:
+        if terms.constraints:
             constraint_boost = self._calculate_constraint_satisfaction(
-                candidate, query_plan.constraints
+                candidate, terms.constraints, normalized_content
             )
             score *= (1.0 + constraint_boost * 0.15)
 
@@ -112,12 +148,27 @@ class Reranker:
 
     def _is_lebanese_relevant(self, candidate: RetrievalCandidate) -> bool:
         """Check if candidate is Lebanese/Mediterranean cuisine"""
-        content_lower = candidate.content.lower()
-        metadata_str = str(candidate.metadata).lower()
+        content_lower = self._content_lower(candidate)
+        if any(indicator in content_lower for indicator in self.lebanese_indicators):
+            return True
+
+        # Scan metadata separately rather than concatenating with content
+        metadata_str = self._metadata_lower(candidate)
+        return any(indicator in metadata_str for indicator in self.lebanese_indicators)
 
-        combined = content_lower + " " + metadata_str
+    @staticmethod
+    def _content_lower(candidate: RetrievalCandidate) -> str:
+        """Lowercased candidate content, precomputed at index build time when available"""
+        if candidate.content_lower is not None:
+            return candidate.content_lower
+        return candidate.content.lower()
 
-        return any(indicator in combined for indicator in self.lebanese_indicators)
+    @staticmethod
+    def _metadata_lower(candidate: RetrievalCandidate) -> str:
+        """Lowercased candidate metadata, precomputed at index build time when available"""
+        if candidate.metadata_lower is not None:
+            return candidate.metadata_lower
+        return str(candidate.metadata).lower()
 
     def _calculate_ingredient_match(self, candidate: RetrievalCandidate, ingredients: list[str]) -> float:
         """
@@ -128,30 +179,40 @@ class Reranker:
         if not ingredients:
             return 0.0
 
-        content_lower = candidate.content.lower()
+        return self._ingredient_match(
+            candidate, tuple(normalize_text(ingredient) for ingredient in ingredients)
+        )
 
-        # For Base 2 candidates, also check metadata ingredients
-        if candidate.source == "base2" and "ingredients" in candidate.metadata:
-            meta_ingredients = candidate.metadata.get("ingredients", [])
-            meta_text = " ".join(str(ing).lower() for ing in meta_ingredients)
-            content_lower += " " + meta_text
+    def _ingredient_match(self, candidate: RetrievalCandidate, normalized_ings: tuple[str, ...]) -> float:
+        """Ingredient match score for already-normalized query ingredients"""
+        # Exact matches against the recipe's normalized ingredient set (Base 2)
+        missing = [ing for ing in normalized_ings if ing not in candidate.ingredient_set]
+        matches = len(normalized_ings) - len(missing)
 
-        normalized_content = normalize_text(content_lower)
+        # Fall back to substring matching in the text for the rest
+        if missing:
+            content_lower = self._content_lower(candidate)
 
-        matches = 0
-        for ingredient in ingredients:
-            normalized_ing = normalize_text(ingredient)
-            if normalized_ing in normalized_content:
-                matches += 1
+            # For Base 2 candidates, also check metadata ingredients
+            if candidate.source == "base2" and "ingredients" in candidate.metadata:
+                meta_ingredients = candidate.metadata.get("ingredients", [])
+                meta_text = " ".join(str(ing).lower() for ing in meta_ingredients)
+                content_lower += " " + meta_text
 
-        return matches / len(ingredients)
+            normalized_content = normalize_text(content_lower)
+            matches += sum(1 for ing in missing if ing in normalized_content)
 
-    def _matches_primary_dish(self, candidate: RetrievalCandidate, primary_dish: str) -> bool:
-        """Check if candidate matches the primary dish"""
-        primary_normalized = normalize_text(primary_dish)
+        return matches / len(normalized_ings)
 
+    def _matches_primary_dish(
+        self,
+        candidate: RetrievalCandidate,
+        primary_normalized: str,
+        normalized_content: str,
+    ) -> bool:
+        """Check if candidate matches the (normalized) primary dish"""
         # Check in content
-        if primary_normalized in normalize_text(candidate.content):
+        if primary_normalized in normalized_content:
             return True
 
         # Check in metadata
@@ -170,24 +231,23 @@ class Reranker:
     def _calculate_constraint_satisfaction(
         self,
         candidate: RetrievalCandidate,
-        constraints: list[str],
+        constraints: tuple[str, ...],
+        normalized_content: str,
     ) -> float:
         """
         Calculate constraint satisfaction score (0.0 to 1.0)
 
-        Returns fraction of constraints satisfied by candidate
+        Returns fraction of (normalized) constraints satisfied by candidate
         """
         if not constraints:
             return 0.0
 
-        content_lower = candidate.content.lower()
-        metadata_str = str(candidate.metadata).lower()
-        combined = content_lower + " " + metadata_str
+        # Content is normalized by the caller; scan metadata separately
+        normalized_metadata = normalize_text(str(candidate.metadata))
 
         satisfied = 0
         for constraint in constraints:
-            constraint_lower = normalize_text(constraint)
-            if constraint_lower in normalize_text(combined):
+            if constraint in normalized_content or constraint in normalized_metadata:
                 satisfied += 1
 
         return satisfied / len(constraints)
@@ -197,25 +257,44 @@ class Reranker:
         candidates: list[RetrievalCandidate],
     ) -> list[RetrievalCandidate]:
         """
-        Remove duplicate candidates
+        Remove duplicate candidates, keeping the highest-scoring copy
+
+        Duplicates can occur when the same recipe appears in both OLJ and Base 2.
+        Returns candidates sorted by score (descending), ties in original order.
+        """
+        return sorted(self._keep_best(candidates), key=lambda c: c.score, reverse=True)
+
+    def _keep_best(self, candidates: Iterable[RetrievalCandidate]) -> list[RetrievalCandidate]:
+        """
+        Collapse duplicates to their highest-scoring copy
 
-        Duplicates can occur when the same recipe appears in both OLJ and Base 2
+        On equal scores the earlier copy wins. Output keeps first-occurrence order.
         """
-        seen_recipes = set()
-        deduped = []
+        position: dict[tuple[str, str | int], int] = {}
+        kept: list[RetrievalCandidate] = []
 
         for candidate in candidates:
-            # Create a unique key based on content
-            if candidate.source == "olj":
-                key = f"olj_{candidate.article_id}"
-            else:
-                key = f"base2_{candidate.recipe_id}"
+            key = self._dedup_key(candidate)
+            i = position.get(key)
+
+            if i is None:
+                position[key] = len(kept)
+                kept.append(candidate)
+            elif candidate.score > kept[i].score:
+                kept[i] = candidate
 
-            if key not in seen_recipes:
-                seen_recipes.add(key)
-                deduped.append(candidate)
+        return kept
 
-        return deduped
+    @staticmethod
+    def _dedup_key(candidate: RetrievalCandidate) -> tuple[str, str | int]:
+        """
+        Unique key for a candidate: OLJ by article_id, Base 2 by recipe_id
+
+        Candidates without an ID are never considered duplicates
+        """
+        if candidate.source == "olj":
+            return ("olj", candidate.article_id or id(candidate))
+        return ("base2", candidate.recipe_id or id(candidate))
 
     def diversify(
         self,
@@ -227,20 +306,9 @@ class Reranker:
 
         Useful to avoid showing only Base 2 or only OLJ results
         """
-        olj_count = 0
-        base2_count = 0
-        diversified = []
+        # Partition by source (keeping original positions), cap each group
+        olj = [(i, c) for i, c in enumerate(candidates) if c.source == "olj"][:max_per_source]
+        base2 = [(i, c) for i, c in enumerate(candidates) if c.source == "base2"][:max_per_source]
 
-        for candidate in candidates:
-            if candidate.source == "olj" and olj_count < max_per_source:
-                diversified.append(candidate)
-                olj_count += 1
-            elif candidate.source == "base2" and base2_count < max_per_source:
-                diversified.append(candidate)
-                base2_count += 1
-
-            # Stop if we have enough from both sources
-            if olj_count >= max_per_source and base2_count >= max_per_source:
-                break
-
-        return diversified
+        # Interleave both groups back in their original rank order
+        return [c for _, c in heapq.merge(olj, base2, key=lambda pair: pair[0])]
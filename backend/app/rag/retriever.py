@@ -3,16 +3,30 @@ RAG Retriever
 Combines content index search with query planning for intelligent retrieval
 """
 
+import functools
+import heapq
 import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Literal
 
-from app.models.schemas import QueryPlan, RetrievalCandidate
-from app.data.content_index import ContentIndex
+import numpy as np
+
+from app.models.schemas import ContentDocument, QueryPlan, RetrievalCandidate
+from app.data.content_index import ContentIndex, top_k_indices
 from app.models.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=128)
+def _constraint_pattern(constraints: tuple[str, ...]) -> re.Pattern:
+    """Compile one alternation matching any of the (lowercased) constraints"""
+    return re.compile("|".join(re.escape(constraint) for constraint in constraints))
+
+
 class Retriever:
     """
     RAG retriever that uses QueryPlan to search content index
@@ -23,9 +37,30 @@ class Retriever:
     - General suggestions (both sources)
     """
 
+    # Reciprocal Rank Fusion for ingredient queries (k=60, Cormack et al.).
+    # Equal weights: the Reranker already favors Base 2 for ingredient queries, and
+    # weighting it here too would push every OLJ article out of the fused top-k.
+    RRF_K = 60
+    RRF_WEIGHTS = {"base2": 1.0, "olj": 1.0}
+
+    # Need types that never require retrieval
+    _NO_RETRIEVAL = frozenset({"greeting", "about_bot", "off_topic"})
+
     def __init__(self, content_index: ContentIndex):
         self.content_index = content_index
 
+        # Retrieval strategy per need type (general search as fallback)
+        self._dispatch = {
+            "recipe_by_ingredients": self._retrieve_by_ingredients,
+            "recipe_by_name": self._retrieve_by_name,
+            "suggestions": self._retrieve_suggestions,
+        }
+
+        # LRU cache of retrieval results for repeated queries (immutable tuples)
+        self._cache: OrderedDict[tuple, tuple[RetrievalCandidate, ...]] = OrderedDict()
+        self._cache_size = settings.retrieval_cache_size
+        self._cache_lock = threading.RLock()
+
     def retrieve(self, query_plan: QueryPlan, top_k: int | None = None) -> list[RetrievalCandidate]:
         """
         Retrieve relevant documents based on query plan
@@ -38,19 +73,44 @@ class Retriever:
         need_type = query_plan.need_type
 
         # No retrieval needed for these types
-        if need_type in ["greeting", "about_bot", "off_topic"]:
+        if need_type in self._NO_RETRIEVAL:
             return []
 
-        # Route to appropriate retrieval strategy
-        if need_type == "recipe_by_ingredients":
-            return self._retrieve_by_ingredients(query_plan, top_k)
-        elif need_type == "recipe_by_name":
-            return self._retrieve_by_name(query_plan, top_k)
-        elif need_type == "suggestions":
-            return self._retrieve_suggestions(query_plan, top_k)
-        else:
-            # Fallback: general search
-            return self._retrieve_general(query_plan, top_k)
+        # Nothing to search for
+        if not query_plan.retrieval_query.strip() and not query_plan.ingredients:
+            return []
+
+        cache_key = (
+            need_type,
+            query_plan.retrieval_query,
+            tuple(sorted(query_plan.ingredients)),
+            query_plan.primary_dish,
+            top_k,
+        )
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+
+        if cached is None:
+            # Route to appropriate retrieval strategy
+            strategy = self._dispatch.get(need_type, self._retrieve_general)
+            cached = tuple(strategy(query_plan, top_k))
+
+            if self._cache_size > 0:
+                with self._cache_lock:
+                    self._cache[cache_key] = cached
+                    self._cache.move_to_end(cache_key)
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+
+        # Candidates are frozen, callers get their own list
+        return list(cached)
+
+    def clear_cache(self) -> None:
+        """Drop all cached retrieval results (e.g. after rebuilding the index)"""
+        with self._cache_lock:
+            self._cache.clear()
 
     def _retrieve_by_ingredients(self, query_plan: QueryPlan, top_k: int) -> list[RetrievalCandidate]:
         """
@@ -58,27 +118,14 @@ class Retriever:
 
         Prioritizes Base 2 structured recipes, but also includes OLJ
         """
-        candidates: list[RetrievalCandidate] = []
-
         # First, search Base 2 using specialized ingredient search
+        base2_results = []
         if query_plan.ingredients:
             base2_results = self.content_index.search_by_ingredients(
                 ingredients=query_plan.ingredients,
                 top_k=top_k,
             )
 
-            for doc, score in base2_results:
-                candidates.append(
-                    RetrievalCandidate(
-                        source=doc.source,
-                        content=doc.content,
-                        score=score * 1.2,  # Boost Base 2 for ingredient queries
-                        metadata=doc.metadata,
-                        article_id=doc.metadata.get("article_id"),
-                        recipe_id=doc.metadata.get("recipe_id"),
-                    )
-                )
-
         # Also search OLJ for context/storytelling
         olj_results = self.content_index.search(
             query=query_plan.retrieval_query,
@@ -86,21 +133,36 @@ class Retriever:
             source_filter="olj",
         )
 
-        for doc, score in olj_results:
-            candidates.append(
-                RetrievalCandidate(
-                    source=doc.source,
-                    content=doc.content,
-                    score=score * 0.8,  # Lower score for OLJ in ingredient search
-                    metadata=doc.metadata,
-                    article_id=doc.metadata.get("article_id"),
-                    recipe_id=doc.metadata.get("recipe_id"),
-                )
+        # Fuse both rankings with weighted Reciprocal Rank Fusion.
+        # Scores from the two searches are not on the same scale, ranks are.
+        # Non-matching documents (zero similarity) must not earn rank credit.
+        # The two lists never share a document (each search covers one source),
+        # so every document gets exactly one rank term.
+        fused: list[tuple[ContentDocument, float, float]] = []
+        for source, results in (("base2", base2_results), ("olj", olj_results)):
+            weight = self.RRF_WEIGHTS[source]
+            matching = [(doc, score) for doc, score in results if score > 0]
+            for rank, (doc, score) in enumerate(matching, start=1):
+                fused.append((doc, weight * (self.RRF_K + 1) / (self.RRF_K + rank), score))
+
+        # Select top-k by fused score, then only build candidates for the winners
+        top_entries = heapq.nlargest(top_k, fused, key=lambda entry: entry[1])
+
+        return [
+            RetrievalCandidate(
+                source=doc.source,
+                content=doc.content,
+                content_lower=doc.content_lower,
+                metadata_lower=doc.metadata_lower,
+                score=score,
+                metadata=doc.metadata,
+                article_id=doc.article_id,
+                recipe_id=doc.recipe_id,
+                ingredient_set=doc.ingredient_set,
+                raw_score=raw_score,
             )
-
-        # Sort by score and return top-k
-        candidates.sort(key=lambda c: c.score, reverse=True)
-        return candidates[:top_k]
+            for doc, score, raw_score in top_entries
+        ]
 
     def _retrieve_by_name(self, query_plan: QueryPlan, top_k: int) -> list[RetrievalCandidate]:
         """
@@ -108,37 +170,47 @@ class Retriever:
 
         Searches both OLJ and Base 2, prioritizing exact matches
         """
-        candidates: list[RetrievalCandidate] = []
-
         # Search both sources
         all_results = self.content_index.search(
             query=query_plan.retrieval_query,
-            top_k=top_k * 2,  # Get more candidates for filtering
+            top_k=top_k * 2,  # Oversample so the primary dish boost can promote docs below the cut
             source_filter="all",
         )
 
-        for doc, score in all_results:
-            # Boost if primary dish matches document
-            boost = 1.0
-            if query_plan.primary_dish:
-                primary_lower = query_plan.primary_dish.lower()
-                if primary_lower in doc.content.lower():
-                    boost = 1.3
+        if not all_results:
+            return []
 
-            candidates.append(
-                RetrievalCandidate(
-                    source=doc.source,
-                    content=doc.content,
-                    score=score * boost,
-                    metadata=doc.metadata,
-                    article_id=doc.metadata.get("article_id"),
-                    recipe_id=doc.metadata.get("recipe_id"),
-                )
+        docs = [doc for doc, _ in all_results]
+        contents_lower = [doc.content_lower for doc in docs]
+        scores = np.fromiter((score for _, score in all_results), dtype=float, count=len(all_results))
+
+        # Boost documents matching the primary dish
+        if query_plan.primary_dish:
+            primary_lower = query_plan.primary_dish.lower()
+            mask = np.fromiter(
+                (primary_lower in content for content in contents_lower),
+                dtype=bool,
+                count=len(contents_lower),
             )
-
-        # Sort by score and return top-k
-        candidates.sort(key=lambda c: c.score, reverse=True)
-        return candidates[:top_k]
+            scores *= np.where(mask, 1.3, 1.0)
+
+        # Select top-k, and only build candidates for those
+        top_indices = top_k_indices(scores, top_k)
+
+        return [
+            RetrievalCandidate(
+                source=docs[i].source,
+                content=docs[i].content,
+                content_lower=contents_lower[i],
+                metadata_lower=docs[i].metadata_lower,
+                score=float(scores[i]),
+                metadata=docs[i].metadata,
+                article_id=docs[i].article_id,
+                recipe_id=docs[i].recipe_id,
+                ingredient_set=docs[i].ingredient_set,
+            )
+            for i in top_indices
+        ]
 
     def _retrieve_suggestions(self, query_plan: QueryPlan, top_k: int) -> list[RetrievalCandidate]:
         """
@@ -160,10 +232,13 @@ class Retriever:
                 RetrievalCandidate(
                     source=doc.source,
                     content=doc.content,
+                    content_lower=doc.content_lower,
+                    metadata_lower=doc.metadata_lower,
                     score=score,
                     metadata=doc.metadata,
-                    article_id=doc.metadata.get("article_id"),
-                    recipe_id=doc.metadata.get("recipe_id"),
+                    article_id=doc.article_id,
+                    recipe_id=doc.recipe_id,
+                    ingredient_set=doc.ingredient_set,
                 )
             )
 
@@ -183,10 +258,13 @@ class Retriever:
                 RetrievalCandidate(
                     source=doc.source,
                     content=doc.content,
+                    content_lower=doc.content_lower,
+                    metadata_lower=doc.metadata_lower,
                     score=score,
                     metadata=doc.metadata,
-                    article_id=doc.metadata.get("article_id"),
-                    recipe_id=doc.metadata.get("recipe_id"),
+                    article_id=doc.article_id,
+                    recipe_id=doc.recipe_id,
+                    ingredient_set=doc.ingredient_set,
                 )
             )
 
@@ -205,25 +283,32 @@ class Retriever:
         if not constraints:
             return candidates
 
-        filtered = []
-        for candidate in candidates:
-            content_lower = candidate.content.lower()
-            metadata_str = str(candidate.metadata).lower()
+        # One alternation pattern matches any constraint in a single scan,
+        # compiled once per distinct constraint set
+        constraint_pattern = _constraint_pattern(
+            tuple(sorted({constraint.lower() for constraint in constraints}))
+        )
 
-            # Check if any constraint is satisfied
-            satisfies_constraint = any(
-                constraint.lower() in content_lower or constraint.lower() in metadata_str
-                for constraint in constraints
-            )
+        # Check if any constraint is satisfied, in content or metadata
+        mask = np.fromiter(
+            (
+                bool(
+                    constraint_pattern.search(candidate.content_lower or candidate.content.lower())
+                    or constraint_pattern.search(candidate.metadata_lower or str(candidate.metadata).lower())
+                )
+                for candidate in candidates
+            ),
+            dtype=bool,
+            count=len(candidates),
+        )
+        scores = np.fromiter((c.score for c in candidates), dtype=float, count=len(candidates))
+
+        # Boost matching candidates, keep the others with lower priority
+        scores *= np.where(mask, 1.1, 0.9)
 
-            if satisfies_constraint:
-                # Boost score for matching constraints
-                candidate.score *= 1.1
-                filtered.append(candidate)
-            else:
-                # Still include but with lower priority
-                candidate.score *= 0.9
-                filtered.append(candidate)
-
-        filtered.sort(key=lambda c: c.score, reverse=True)
-        return filtered
+        # Return rescored copies, the input candidates are left untouched
+        order = np.argsort(-scores, kind="stable")
+        return [
+            replace(candidates[i], score=float(scores[i]))
+            for i in order
+        ]
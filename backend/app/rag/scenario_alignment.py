@@ -4,7 +4,7 @@ Maps query understanding to editorial scenarios
 """
 
 import logging
-from typing import Literal
+from typing import Literal, NamedTuple
 
 from app.models.schemas import (
     ClassificationResult,
@@ -17,66 +17,99 @@ from app.models.schemas import (
 logger = logging.getLogger(__name__)
 
 
-# Scenario definitions
-SCENARIOS = {
-    1: {
-        "name": "olj_recipe_available",
-        "description": "OLJ recipe exists, storytelling only with link",
-        "use_base": "olj",
-        "show_full_recipe": False,
-        "include_link": True,
-    },
-    2: {
-        "name": "base2_recipe_with_olj_suggestion",
-        "description": "Base 2 recipe with OLJ article suggestion",
-        "use_base": "base2",
-        "show_full_recipe": True,
-        "include_link": True,
-    },
-    3: {
-        "name": "no_match_with_fallback",
-        "description": "No match found, suggest fallback OLJ article",
-        "use_base": "none",
-        "show_full_recipe": False,
-        "include_link": True,
-    },
-    4: {
-        "name": "greeting",
-        "description": "User greeting with OLJ suggestion",
-        "use_base": "none",
-        "show_full_recipe": False,
-        "include_link": True,
-    },
-    5: {
-        "name": "about_bot",
-        "description": "Bot self-description with OLJ example",
-        "use_base": "none",
-        "show_full_recipe": False,
-        "include_link": True,
-    },
-    6: {
-        "name": "off_topic_redirect",
-        "description": "Off-topic query, redirect to cuisine + OLJ link",
-        "use_base": "none",
-        "show_full_recipe": False,
-        "include_link": True,
-    },
-    7: {
-        "name": "non_french_polite_decline",
-        "description": "Non-French query, polite decline in French",
-        "use_base": "none",
-        "show_full_recipe": False,
-        "include_link": False,
-    },
-    8: {
-        "name": "ingredient_suggestions",
-        "description": "Multiple recipe suggestions based on ingredients",
-        "use_base": "mixed",
-        "show_full_recipe": False,
-        "include_link": True,
-    },
+class _ScenarioDef(NamedTuple):
+    """Static definition of an editorial scenario"""
+
+    name: str
+    description: str
+    use_base: Literal["olj", "base2", "mixed", "none"]
+    show_full_recipe: bool
+    include_link: bool
+
+
+# Scenario definitions indexed by scenario ID (index 0 unused)
+SCENARIOS: tuple[_ScenarioDef | None, ...] = (
+    None,
+    _ScenarioDef(  # 1
+        name="olj_recipe_available",
+        description="OLJ recipe exists, storytelling only with link",
+        use_base="olj",
+        show_full_recipe=False,
+        include_link=True,
+    ),
+    _ScenarioDef(  # 2
+        name="base2_recipe_with_olj_suggestion",
+        description="Base 2 recipe with OLJ article suggestion",
+        use_base="base2",
+        show_full_recipe=True,
+        include_link=True,
+    ),
+    _ScenarioDef(  # 3
+        name="no_match_with_fallback",
+        description="No match found, suggest fallback OLJ article",
+        use_base="none",
+        show_full_recipe=False,
+        include_link=True,
+    ),
+    _ScenarioDef(  # 4
+        name="greeting",
+        description="User greeting with OLJ suggestion",
+        use_base="none",
+        show_full_recipe=False,
+        include_link=True,
+    ),
+    _ScenarioDef(  # 5
+        name="about_bot",
+        description="Bot self-description with OLJ example",
+        use_base="none",
+        show_full_recipe=False,
+        include_link=True,
+    ),
+    _ScenarioDef(  # 6
+        name="off_topic_redirect",
+        description="Off-topic query, redirect to cuisine + OLJ link",
+        use_base="none",
+        show_full_recipe=False,
+        include_link=True,
+    ),
+    _ScenarioDef(  # 7
+        name="non_french_polite_decline",
+        description="Non-French query, polite decline in French",
+        use_base="none",
+        show_full_recipe=False,
+        include_link=False,
+    ),
+    _ScenarioDef(  # 8
+        name="ingredient_suggestions",
+        description="Multiple recipe suggestions based on ingredients",
+        use_base="mixed",
+        show_full_recipe=False,
+        include_link=True,
+    ),
+)
+
+
+# Non-food intents that map directly to a scenario
+_INTENT_SCENARIOS = {
+    "greeting": 4,
+    "farewell": 4,
+    "about_bot": 5,
+    "off_topic": 6,
+    "anti_injection": 6,
 }
 
+# Prebuilt, immutable contexts indexed by scenario ID (index 0 unused)
+_SCENARIO_CONTEXTS: tuple[ScenarioContext | None, ...] = (None,) + tuple(
+    ScenarioContext(
+        scenario_id=scenario_id,
+        scenario_name=scenario.name,
+        use_base=scenario.use_base,
+        show_full_recipe=scenario.show_full_recipe,
+        include_link=scenario.include_link,
+    )
+    for scenario_id, scenario in enumerate(SCENARIOS[1:], start=1)
+)
+
 
 class ScenarioAligner:
     """
@@ -116,14 +149,9 @@ class ScenarioAligner:
             return self._create_context(7)
 
         # Intent-based scenarios
-        if classification.intent == "greeting" or classification.intent == "farewell":
-            return self._create_context(4)
-
-        if classification.intent == "about_bot":
-            return self._create_context(5)
-
-        if classification.intent == "off_topic" or classification.intent == "anti_injection":
-            return self._create_context(6)
+        scenario_id = _INTENT_SCENARIOS.get(classification.intent)
+        if scenario_id is not None:
+            return self._create_context(scenario_id)
 
         # Food request scenarios
         if classification.intent == "food_request":
@@ -134,9 +162,11 @@ class ScenarioAligner:
 
             # Check if we have Base 2 recipes
             if retrieval_candidates:
-                base2_candidates = [c for c in retrieval_candidates if c.source == "base2"]
+                # Candidates are sorted by score, so the first Base 2 one is the best
+                first_base2 = next((c for c in retrieval_candidates if c.source == "base2"), None)
 
-                if base2_candidates and base2_candidates[0].score > 0.4:
+                # Threshold on real similarity, not on a fused rank score
+                if first_base2 and first_base2.relevance > 0.4:
                     # Good Base 2 match → scenario 2
                     return self._create_context(2)
 
@@ -151,22 +181,15 @@ class ScenarioAligner:
         return self._create_context(3)
 
     def _create_context(self, scenario_id: int) -> ScenarioContext:
-        """Create ScenarioContext from scenario ID"""
-        scenario_def = SCENARIOS.get(scenario_id)
-
-        if not scenario_def:
-            logger.error(f"Unknown scenario ID: {scenario_id}")
-            scenario_def = SCENARIOS[3]  # Fallback to scenario 3
+        """Get the shared ScenarioContext for a scenario ID"""
+        if 0 < scenario_id < len(_SCENARIO_CONTEXTS):
+            return _SCENARIO_CONTEXTS[scenario_id]
 
-        return ScenarioContext(
-            scenario_id=scenario_id,
-            scenario_name=scenario_def["name"],
-            use_base=scenario_def["use_base"],
-            show_full_recipe=scenario_def["show_full_recipe"],
-            include_link=scenario_def["include_link"],
-        )
+        logger.error(f"Unknown scenario ID: {scenario_id}")
+        return _SCENARIO_CONTEXTS[3]  # Fallback to scenario 3
 
     def get_scenario_description(self, scenario_id: int) -> str:
         """Get human-readable scenario description"""
-        scenario = SCENARIOS.get(scenario_id)
-        return scenario["description"] if scenario else "Unknown scenario"
+        if 0 < scenario_id < len(SCENARIOS):
+            return SCENARIOS[scenario_id].description
+        return "Unknown scenario"
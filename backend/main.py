@@ -4,16 +4,22 @@ Lebanese culinary chatbot for L'Orient-Le Jour
 Production-ready with all P0 fixes implemented
 """
 
+import asyncio
+import hashlib
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 
 from app.api.routes import router as api_router
+from app.data.content_index import ContentIndex
+from app.data.link_index import LinkIndex
+from app.data.loaders import data_cache
 from app.models.config import settings
+from app.rag.pipeline import initialize_pipeline
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +29,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Frontend UI served at "/"
+FRONTEND_PATH = Path(__file__).parent.parent / "frontend" / "index.html"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -33,33 +42,39 @@ async def lifespan(app: FastAPI):
 
     # Initialize data loaders and indexes
     logger.info("Loading data and building indexes...")
-    from app.data.loaders import data_cache
-    from app.data.content_index import ContentIndex
-    from app.data.link_index import LinkIndex
-    from app.rag.pipeline import initialize_pipeline
 
     # Load data
     articles = data_cache.get_olj_articles()
     recipes = data_cache.get_structured_recipes()
     logger.info(f"Loaded {len(articles)} OLJ articles and {len(recipes)} recipes")
 
-    # Build content index
+    # Populate content and link indexes
     content_index = ContentIndex()
     content_index.add_olj_articles(articles)
     content_index.add_structured_recipes(recipes)
-    content_index.build()
-    logger.info(f"Content index built with {len(content_index)} documents")
 
-    # Build link index
     link_index = LinkIndex()
     link_index.add_articles(articles)
-    link_index.build()
+
+    # Build both indexes concurrently (independent state, CPU-heavy fitting)
+    await asyncio.gather(
+        asyncio.to_thread(content_index.build),
+        asyncio.to_thread(link_index.build),
+    )
+    logger.info(f"Content index built with {len(content_index)} documents")
     logger.info(f"Link index built with {len(link_index)} articles")
 
     # Initialize RAG pipeline
     initialize_pipeline(content_index, link_index)
     logger.info("RAG pipeline initialized and ready")
 
+    # Cache the frontend page in memory, with a content-based ETag
+    app.state.frontend_html = None
+    if FRONTEND_PATH.exists():
+        app.state.frontend_html = FRONTEND_PATH.read_bytes()
+        digest = hashlib.blake2b(app.state.frontend_html, digest_size=8).hexdigest()
+        app.state.frontend_etag = f'"{digest}"'
+
     yield
 
     logger.info(f"Shutting down {settings.app_name}")
@@ -86,15 +101,36 @@ app.add_middleware(
 app.include_router(api_router, prefix=settings.api_prefix)
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check (RFC 9110 13.1.2): "*", comma-separated lists, weak comparison"""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # Weak comparison: W/"x" matches "x"
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the frontend UI"""
-    # Path to frontend HTML file
-    frontend_path = Path(__file__).parent.parent / "frontend" / "index.html"
+    # If frontend exists, serve the cached page
+    frontend_html = getattr(request.app.state, "frontend_html", None)
+    if frontend_html is not None:
+        etag = request.app.state.frontend_etag
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+
+        # Client already has this version
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
 
-    # If frontend exists, serve it
-    if frontend_path.exists():
-        return FileResponse(frontend_path)
+        return Response(frontend_html, media_type="text/html", headers=headers)
 
     # Otherwise, return JSON status
     return {
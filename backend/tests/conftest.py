@@ -0,0 +1,110 @@
+"""
+Shared pytest fixtures
+"""
+
+import functools
+
+import pytest
+from app.rag.pipeline import RAGPipeline
+from app.rag.retriever import Retriever
+from app.rag.classifier_agent import ClassifierAgent
+from app.rag.query_planner_agent import QueryPlannerAgent
+from app.data.loaders import data_cache
+from app.data.content_index import ContentIndex
+from app.data.link_index import LinkIndex
+from app.models.llm_client import MockLLMClient
+
+
+@pytest.fixture(scope="session")
+def content_index():
+    """Content index built once per test session"""
+    index = ContentIndex()
+    index.add_olj_articles(data_cache.get_olj_articles())
+    index.add_structured_recipes(data_cache.get_structured_recipes())
+    index.build()
+    return index
+
+
+@pytest.fixture(scope="session")
+def link_index():
+    """Link index built once per test session"""
+    index = LinkIndex()
+    index.add_articles(data_cache.get_olj_articles())
+    index.build()
+    return index
+
+
+@pytest.fixture(scope="session")
+def retriever(content_index):
+    """Retriever shared across tests, so repeated plans hit its result cache"""
+    return Retriever(content_index)
+
+
+@pytest.fixture(scope="session")
+def pipeline(content_index, link_index):
+    """Complete pipeline with real data and mock LLM"""
+    return RAGPipeline(
+        content_index=content_index,
+        link_index=link_index,
+        llm_client=MockLLMClient(),
+    )
+
+
+@pytest.fixture(scope="session")
+def process(pipeline):
+    """Memoized pipeline.process: scenario and URL are stable per query, composer wording is random, so only assert on it loosely"""
+
+    @functools.lru_cache(maxsize=512)
+    def _process(query: str, debug: bool = False):
+        return pipeline.process(query, debug=debug)
+
+    return _process
+
+
+@pytest.fixture(scope="session")
+def processed(process):
+    """Memoized (response, lowercased HTML) pair per query"""
+
+    @functools.lru_cache(maxsize=512)
+    def _processed(query: str, debug: bool = False):
+        response = process(query, debug=debug)
+        return response, response.html.lower()
+
+    return _processed
+
+
+@pytest.fixture(scope="session")
+def golden_examples():
+    """Load golden examples"""
+    return data_cache.get_golden_examples()
+
+
+@pytest.fixture(scope="session")
+def classifier():
+    """Create classifier with mock LLM"""
+    return ClassifierAgent(llm_client=MockLLMClient())
+
+
+@pytest.fixture(scope="session")
+def planner():
+    """Create query planner"""
+    return QueryPlannerAgent()
+
+
+@pytest.fixture(scope="session")
+def classify_and_plan(classifier, planner):
+    """Memoized classification + query plan per query string"""
+    cache = {}
+
+    def _classify_and_plan_many(queries: list[str]):
+        # Classify all uncached queries in one batch
+        missing = [query for query in dict.fromkeys(queries) if query not in cache]
+        for query, classification in zip(missing, classifier.classify_batch(missing)):
+            cache[query] = (classification, planner.plan(classification, query))
+        return [cache[query] for query in queries]
+
+    def _classify_and_plan(query: str):
+        return _classify_and_plan_many([query])[0]
+
+    _classify_and_plan.many = _classify_and_plan_many
+    return _classify_and_plan
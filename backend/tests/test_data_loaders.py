@@ -9,8 +9,7 @@ from app.data.loaders import (
     load_golden_examples,
     data_cache,
 )
-from app.data.content_index import ContentIndex
-from app.data.link_index import LinkIndex
+from app.data.content_index import ContentIndex, top_k_indices
 from app.data.culinary_graph import culinary_graph
 
 
@@ -75,12 +74,9 @@ def test_data_cache():
 
 def test_content_index():
     """Test content index building and search"""
-    articles = data_cache.get_olj_articles()
-    recipes = data_cache.get_structured_recipes()
-
     index = ContentIndex()
-    index.add_olj_articles(articles)
-    index.add_structured_recipes(recipes)
+    index.add_olj_articles(data_cache.get_olj_articles())
+    index.add_structured_recipes(data_cache.get_structured_recipes())
     index.build()
 
     assert index.is_built
@@ -96,23 +92,64 @@ def test_content_index():
     assert 0 <= score <= 1
 
 
-def test_link_index():
-    """Test link index for article resolution"""
-    articles = data_cache.get_olj_articles()
+def test_content_index_ingredient_set_outside_metadata(content_index):
+    """Test Base 2 ingredient sets are a document attribute, not stringified metadata"""
+    base2_docs = [doc for doc in content_index.documents if doc.source == "base2"]
 
-    index = LinkIndex()
-    index.add_articles(articles)
-    index.build()
+    assert base2_docs
+    assert all(doc.ingredient_set for doc in base2_docs)
+    assert all("ingredient_set" not in doc.metadata for doc in content_index.documents)
+    assert all("frozenset" not in doc.metadata_lower for doc in content_index.documents)
 
-    assert index.is_built
-    assert len(index) > 0
+
+def test_top_k_indices():
+    """Test top-k selection: best first, ties in index order, out-of-range k"""
+    import numpy as np
+
+    scores = np.array([0.2, 0.5, 0.2, 0.9, 0.2, 0.0])
+
+    assert top_k_indices(scores, 3).tolist() == [3, 1, 0]
+    assert top_k_indices(scores, 4).tolist() == [3, 1, 0, 2]
+    assert top_k_indices(scores, 10).tolist() == [3, 1, 0, 2, 4, 5]
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+def test_content_index_search_ties_keep_index_order(content_index):
+    """Test tied scores come back lowest index first (zero-score filler is deterministic)"""
+    results = content_index.search("xyzzy plugh", top_k=5)
+
+    assert all(score == 0 for _, score in results)
+    assert [doc.doc_id for doc, _ in results] == [doc.doc_id for doc in content_index.documents[:5]]
+
+    base2_results = content_index.search("xyzzy plugh", top_k=3, source_filter="base2")
+    base2_docs = [doc for doc in content_index.documents if doc.source == "base2"]
+    assert [doc.doc_id for doc, _ in base2_results] == [doc.doc_id for doc in base2_docs[:3]]
+
+
+def test_content_index_caches_query_vectors(content_index):
+    """Test repeated queries reuse the cached query vector"""
+    first = content_index.search("Taboulé libanais", top_k=5, source_filter="olj")
+    cached_vector = content_index._vectorize_query("taboule libanais")
+
+    # Same normalized query, different casing and source
+    content_index.search("TABOULÉ libanais", top_k=5, source_filter="base2")
+    assert content_index._vectorize_query("taboule libanais") is cached_vector
+
+    again = content_index.search("Taboulé libanais", top_k=5, source_filter="olj")
+    assert [(doc.doc_id, score) for doc, score in again] == [(doc.doc_id, score) for doc, score in first]
+
+
+def test_link_index(link_index):
+    """Test link index for article resolution"""
+    assert link_index.is_built
+    assert len(link_index) > 0
 
     # Test exact match (if "taboulé" article exists)
-    exact = index.find_exact_match("taboulé")
+    exact = link_index.find_exact_match("taboulé")
     # May or may not find exact match depending on data
 
     # Test similarity search
-    results = index.find_best_match("taboulé", top_k=3)
+    results = link_index.find_best_match("taboulé", top_k=3)
     if results:
         article, score, strategy = results[0]
         assert article.url.startswith("https://www.lorientlejour.com")
@@ -120,7 +157,7 @@ def test_link_index():
         assert strategy in ["exact", "high_similarity", "moderate_similarity", "low_similarity"]
 
     # Test fallback
-    fallbacks = index.get_fallback_articles(strategy="recent", count=3)
+    fallbacks = link_index.get_fallback_articles(strategy="recent", count=3)
     assert len(fallbacks) <= 3
     for article in fallbacks:
         assert article.url.startswith("https://www.lorientlejour.com")
@@ -6,45 +6,34 @@ Validates editorial compliance and expected behaviors
 
 import pytest
 import logging
-from app.rag.pipeline import RAGPipeline
+import re
+from time import perf_counter
 from app.data.loaders import data_cache
-from app.data.content_index import ContentIndex
-from app.data.link_index import LinkIndex
-from app.models.llm_client import MockLLMClient
 from app.models.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Loaded at collection time so zero-tolerance checks run (and fail) per example
+GOLDEN_EXAMPLES = data_cache.get_golden_examples()
 
-@pytest.fixture(scope="module")
-def pipeline():
-    """Create complete pipeline with real data"""
-    # Load data
-    articles = data_cache.get_olj_articles()
-    recipes = data_cache.get_structured_recipes()
-
-    # Build indexes
-    content_index = ContentIndex()
-    content_index.add_olj_articles(articles)
-    content_index.add_structured_recipes(recipes)
-    content_index.build()
-
-    link_index = LinkIndex()
-    link_index.add_articles(articles)
-    link_index.build()
-
-    # Create pipeline with mock LLM
-    return RAGPipeline(
-        content_index=content_index,
-        link_index=link_index,
-        llm_client=MockLLMClient(),
-    )
+_URL_RE = re.compile(r'https?://[^\s<>"]+')
+
+# Expected scenario IDs per golden scenario name
+_SCENARIO_MAP = {
+    "greeting": frozenset({4, 7}),  # Greeting or non-French
+    "about_bot": frozenset({5}),
+    "off_topic": frozenset({3, 6}),  # Fallback or redirect
+    "recipe_query": frozenset({1, 2, 8}),  # OLJ, Base2+OLJ, or ingredient suggestions
+    "non_french": frozenset({7}),
+}
 
+# Common French words, matched in one pass
+_FRENCH_RE = re.compile(r"\b(?:le|la|les|de|du|pour|avec|recette)\b")
 
-@pytest.fixture(scope="module")
-def golden_examples():
-    """Load golden examples"""
-    return data_cache.get_golden_examples()
+# Shouldn't reveal actual ingredient lists for OLJ articles (matched on lowercased HTML)
+_HALLUCINATION_RE = re.compile(
+    r"ingrédients :|ingredients:|• 200g|• 1 cuillère"  # Lists and specific measurements
+)
 
 
 def test_golden_examples_loaded(golden_examples):
@@ -53,94 +42,61 @@ def test_golden_examples_loaded(golden_examples):
     logger.info(f"Loaded {len(golden_examples)} golden examples")
 
 
-def test_all_golden_examples_produce_valid_html(pipeline, golden_examples):
-    """Test that all golden examples produce valid HTML responses"""
-    failures = []
-
-    for example in golden_examples:
-        try:
-            response = pipeline.process(example.user_query, debug=False)
-
-            # Should have HTML
-            if not response.html:
-                failures.append(f"{example.id}: No HTML generated")
-                continue
-
-            # Should have <p> tags
-            if "<p>" not in response.html and "<a" not in response.html:
-                failures.append(f"{example.id}: No <p> or <a> tags in HTML")
+@pytest.mark.parametrize("example", GOLDEN_EXAMPLES, ids=lambda e: e.id)
+def test_golden_example_produces_valid_html(process, example):
+    """Test that a golden example produces a valid HTML response"""
+    response = process(example.user_query, debug=False)
 
-            # Should not have Markdown
-            if "**" in response.html or response.html.strip().startswith("#"):
-                failures.append(f"{example.id}: Contains Markdown syntax")
+    # Should have HTML
+    assert response.html, f"{example.id}: No HTML generated"
 
-        except Exception as e:
-            failures.append(f"{example.id}: Exception - {e}")
-
-    if failures:
-        logger.error("Golden example failures:\n" + "\n".join(failures))
-
-    assert len(failures) == 0, f"{len(failures)} golden examples failed:\n" + "\n".join(failures[:5])
-
-
-def test_golden_examples_url_safety(pipeline, golden_examples):
-    """Test that all URLs in golden example responses are safe"""
-    import re
-    failures = []
-
-    for example in golden_examples:
-        try:
-            response = pipeline.process(example.user_query, debug=False)
+    # Should have <p> tags
+    assert "<p>" in response.html or "<a" in response.html, (
+        f"{example.id}: No <p> or <a> tags in HTML"
+    )
 
-            # Check primary URL
-            if response.primary_url:
-                if not response.primary_url.startswith(settings.allowed_url_domain):
-                    failures.append(
-                        f"{example.id}: Invalid primary URL - {response.primary_url}"
-                    )
+    # Should not have Markdown
+    assert "**" not in response.html and not response.html.strip().startswith("#"), (
+        f"{example.id}: Contains Markdown syntax"
+    )
 
-            # Check URLs in HTML
-            urls = re.findall(r'https?://[^\s<>"]+', response.html)
-            for url in urls:
-                if not url.startswith(settings.allowed_url_domain):
-                    failures.append(f"{example.id}: Invalid URL in HTML - {url}")
 
-        except Exception as e:
-            failures.append(f"{example.id}: Exception - {e}")
+@pytest.mark.parametrize("example", GOLDEN_EXAMPLES, ids=lambda e: e.id)
+def test_golden_example_url_safety(process, example):
+    """Test that all URLs in a golden example response are safe"""
+    allowed = settings.allowed_url_domain
+    response = process(example.user_query, debug=False)
 
-    if failures:
-        logger.error("URL safety failures:\n" + "\n".join(failures))
+    # Check primary URL
+    if response.primary_url:
+        assert response.primary_url.startswith(allowed), (
+            f"{example.id}: Invalid primary URL - {response.primary_url}"
+        )
 
-    assert len(failures) == 0, f"{len(failures)} URLs failed validation:\n" + "\n".join(failures[:5])
+    # Check URLs in HTML, reporting the first offending one
+    bad_url = next((url for url in _URL_RE.findall(response.html) if not url.startswith(allowed)), None)
+    assert bad_url is None, f"{example.id}: Invalid URL in HTML - {bad_url}"
 
 
-def test_golden_examples_scenario_alignment(pipeline, golden_examples):
+def test_golden_examples_scenario_alignment(process, golden_examples):
     """Test that golden examples map to expected scenarios"""
-    scenario_mapping = {
-        "greeting": [4, 7],  # Greeting or non-French
-        "about_bot": [5],
-        "off_topic": [3, 6],  # Fallback or redirect
-        "recipe_query": [1, 2, 8],  # OLJ, Base2+OLJ, or ingredient suggestions
-        "non_french": [7],
-    }
-
     failures = []
 
     for example in golden_examples:
-        expected_scenarios = scenario_mapping.get(example.scenario, [])
+        expected_scenarios = _SCENARIO_MAP.get(example.scenario)
 
         if not expected_scenarios:
             # Unknown scenario in golden data, skip
             continue
 
         try:
-            response = pipeline.process(example.user_query, debug=False)
+            response = process(example.user_query, debug=False)
 
             if response.scenario_id not in expected_scenarios:
                 failures.append(
                     f"{example.id} ({example.scenario}): "
                     f"Got scenario {response.scenario_id}, "
-                    f"expected one of {expected_scenarios}"
+                    f"expected one of {sorted(expected_scenarios)}"
                 )
 
         except Exception as e:
@@ -158,19 +114,16 @@ def test_golden_examples_scenario_alignment(pipeline, golden_examples):
     )
 
 
-def test_golden_examples_french_responses(pipeline, golden_examples):
+def test_golden_examples_french_responses(processed, golden_examples):
     """Test that all responses are in French (except non-French scenario)"""
     failures = []
 
-    french_indicators = ["le", "la", "les", "de", "du", "pour", "avec", "recette"]
-
     for example in golden_examples:
         try:
-            response = pipeline.process(example.user_query, debug=False)
+            response, html_lower = processed(example.user_query)
 
             # Check if response contains French words
-            html_lower = response.html.lower()
-            has_french = any(word in html_lower for word in french_indicators)
+            has_french = bool(_FRENCH_RE.search(html_lower))
 
             if not has_french and response.scenario_id != 7:  # Skip non-French scenario
                 failures.append(f"{example.id}: Response may not be in French")
@@ -189,33 +142,22 @@ def test_golden_examples_french_responses(pipeline, golden_examples):
     )
 
 
-def test_golden_examples_no_hallucinated_content(pipeline, golden_examples):
+def test_golden_examples_no_hallucinated_content(processed, golden_examples):
     """Test that responses don't contain hallucinated OLJ recipe content"""
-    hallucination_indicators = [
-        # Shouldn't reveal actual ingredient lists for OLJ articles
-        "ingrédients :",
-        "ingredients:",
-        "• 200g",  # Specific measurements
-        "• 1 cuillère",
-    ]
-
     failures = []
 
     for example in golden_examples:
         try:
-            response = pipeline.process(example.user_query, debug=True)
+            response, html_lower = processed(example.user_query)
 
             # Only check OLJ scenario responses
             if response.scenario_id == 1:  # OLJ recipe available
-                html_lower = response.html.lower()
-
-                for indicator in hallucination_indicators:
-                    if indicator.lower() in html_lower:
-                        failures.append(
-                            f"{example.id}: May contain hallucinated "
-                            f"ingredient list: '{indicator}'"
-                        )
-                        break
+                match = _HALLUCINATION_RE.search(html_lower)
+                if match:
+                    failures.append(
+                        f"{example.id}: May contain hallucinated "
+                        f"ingredient list: '{match.group(0)}'"
+                    )
 
         except Exception as e:
             failures.append(f"{example.id}: Exception - {e}")
@@ -230,13 +172,22 @@ def test_golden_examples_no_hallucinated_content(pipeline, golden_examples):
     )
 
 
+def _clear_pipeline_caches(pipeline):
+    """Drop memoized retrieval results and query vectors"""
+    pipeline.retriever.clear_cache()
+    pipeline.content_index.clear_query_cache()
+
+
 def test_golden_examples_consistency(pipeline, golden_examples):
     """Test that same query produces consistent scenario"""
-    # Test with a subset (first 10 examples)
-    test_examples = golden_examples[:min(10, len(golden_examples))]
+    # Test with a few representative examples (first 3)
+    test_examples = golden_examples[:min(3, len(golden_examples))]
 
     for example in test_examples:
+        # Cold caches on both runs, otherwise the second one just replays the first
+        _clear_pipeline_caches(pipeline)
         response1 = pipeline.process(example.user_query, debug=False)
+        _clear_pipeline_caches(pipeline)
         response2 = pipeline.process(example.user_query, debug=False)
 
         # Should have same scenario
@@ -253,24 +204,27 @@ def test_golden_examples_consistency(pipeline, golden_examples):
 
 def test_golden_examples_performance(pipeline, golden_examples):
     """Test that golden examples process in reasonable time"""
-    import time
-
     # Test with first 5 examples
     test_examples = golden_examples[:min(5, len(golden_examples))]
 
-    total_time = 0
+    total_time = 0.0
     for example in test_examples:
-        start = time.time()
+        # Time the cold path, not a replay of earlier tests' cached retrievals
+        _clear_pipeline_caches(pipeline)
+        start = perf_counter()
         pipeline.process(example.user_query, debug=False)
-        elapsed = time.time() - start
+        elapsed = perf_counter() - start
         total_time += elapsed
 
-        # Should process in under 2 seconds (with mock LLM)
+        # No single example should be pathologically slow (with mock LLM)
         assert elapsed < 2.0, f"{example.id}: Took {elapsed:.2f}s (too slow)"
 
     avg_time = total_time / len(test_examples)
     logger.info(f"Average processing time: {avg_time:.3f}s")
 
+    # Batch budget tolerates jitter on individual examples
+    assert avg_time < 0.5, f"Average processing time {avg_time:.3f}s (too slow)"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -5,50 +5,20 @@ Ensures ultra-precise URL handling with no generation
 
 import pytest
 from app.rag.link_resolver import LinkResolver
-from app.rag.classifier_agent import ClassifierAgent
-from app.rag.query_planner_agent import QueryPlannerAgent
-from app.data.loaders import data_cache
-from app.data.link_index import LinkIndex
-from app.models.llm_client import MockLLMClient
 from app.models.config import settings
 
 
-@pytest.fixture(scope="module")
-def link_index():
-    """Create and build link index"""
-    articles = data_cache.get_olj_articles()
-
-    index = LinkIndex()
-    index.add_articles(articles)
-    index.build()
-
-    return index
-
-
 @pytest.fixture
 def resolver(link_index):
     """Create link resolver"""
     return LinkResolver(link_index)
 
 
-@pytest.fixture
-def classifier():
-    """Create classifier"""
-    return ClassifierAgent(llm_client=MockLLMClient())
-
-
-@pytest.fixture
-def planner():
-    """Create planner"""
-    return QueryPlannerAgent()
-
-
-def test_resolve_with_exact_match(resolver, classifier, planner):
+def test_resolve_with_exact_match(resolver, classify_and_plan):
     """Test resolution with exact dish name match"""
     # Use a common Lebanese dish that likely exists in the data
     query = "recette de taboulé"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     result = resolver.resolve(plan)
 
@@ -59,11 +29,10 @@ def test_resolve_with_exact_match(resolver, classifier, planner):
         assert resolver.validate_url(result.primary_article.url)
 
 
-def test_resolve_no_link_for_greeting(resolver, classifier, planner):
+def test_resolve_no_link_for_greeting(resolver, classify_and_plan):
     """Test that greetings get a fallback article to showcase OLJ content"""
     query = "Bonjour"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     result = resolver.resolve(plan)
 
@@ -74,12 +43,11 @@ def test_resolve_no_link_for_greeting(resolver, classifier, planner):
     assert resolver.validate_url(result.primary_article.url)
 
 
-def test_resolve_fallback_when_no_match(resolver, classifier, planner):
+def test_resolve_fallback_when_no_match(resolver, classify_and_plan):
     """Test fallback strategy when no match is found"""
     # Query for something unlikely to match
     query = "recette de pizza hawaïenne"  # Not Lebanese
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     result = resolver.resolve(plan)
 
@@ -89,7 +57,7 @@ def test_resolve_fallback_when_no_match(resolver, classifier, planner):
         assert resolver.validate_url(result.primary_article.url)
 
 
-def test_all_urls_are_valid(resolver, classifier, planner):
+def test_all_urls_are_valid(resolver, classify_and_plan):
     """Test that all resolved URLs are from allowed domain"""
     queries = [
         "recette de hummus",
@@ -98,9 +66,7 @@ def test_all_urls_are_valid(resolver, classifier, planner):
         "dessert libanais",
     ]
 
-    for query in queries:
-        classification = classifier.classify(query)
-        plan = planner.plan(classification, query)
+    for query, (classification, plan) in zip(queries, classify_and_plan.many(queries)):
         result = resolver.resolve(plan)
 
         if result.primary_article:
@@ -112,23 +78,26 @@ def test_all_urls_are_valid(resolver, classifier, planner):
                 f"Invalid suggested URL for query '{query}': {suggested.url}"
 
 
-def test_validate_url_rejects_invalid(resolver):
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://www.lorientlejour.com/cuisine-liban-a-table/1234/recipe.html", True),
+        ("https://example.com/recipe.html", False),
+        ("http://www.lorientlejour.com/recipe.html", False),  # Wrong protocol
+        ("", False),
+        ("not-a-url", False),
+    ],
+    ids=["valid", "other_domain", "wrong_protocol", "empty", "not_a_url"],
+)
+def test_validate_url_rejects_invalid(resolver, url, expected):
     """Test URL validation rejects invalid domains"""
-    # Valid URL
-    assert resolver.validate_url("https://www.lorientlejour.com/cuisine-liban-a-table/1234/recipe.html")
+    assert resolver.validate_url(url) is expected
 
-    # Invalid URLs
-    assert not resolver.validate_url("https://example.com/recipe.html")
-    assert not resolver.validate_url("http://www.lorientlejour.com/recipe.html")  # Wrong protocol
-    assert not resolver.validate_url("")
-    assert not resolver.validate_url("not-a-url")
 
-
-def test_suggested_articles_are_relevant(resolver, classifier, planner):
+def test_suggested_articles_are_relevant(resolver, classify_and_plan):
     """Test that suggested articles are relevant and not duplicates"""
     query = "recette de taboulé"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     result = resolver.resolve(plan)
 
@@ -148,12 +117,10 @@ def test_resolve_from_candidates(resolver):
     from app.models.schemas import RetrievalCandidate, QueryPlan
 
     # Get a real article from the index
-    articles = list(resolver.link_index._article_by_id.values())
-    if not articles:
+    test_article = next(iter(resolver.link_index._article_by_id.values()), None)
+    if test_article is None:
         pytest.skip("No articles in index")
 
-    test_article = articles[0]
-
     # Create a mock retrieval candidate
     candidate = RetrievalCandidate(
         source="olj",
@@ -181,7 +148,7 @@ def test_resolve_from_candidates(resolver):
     assert result.strategy == "from_retrieval"
 
 
-def test_confidence_scores_are_valid(resolver, classifier, planner):
+def test_confidence_scores_are_valid(resolver, classify_and_plan):
     """Test that confidence scores are in valid range [0, 1]"""
     queries = [
         "recette de hummus",
@@ -189,9 +156,7 @@ def test_confidence_scores_are_valid(resolver, classifier, planner):
         "dessert oriental",
     ]
 
-    for query in queries:
-        classification = classifier.classify(query)
-        plan = planner.plan(classification, query)
+    for query, (classification, plan) in zip(queries, classify_and_plan.many(queries)):
         result = resolver.resolve(plan)
 
         assert 0 <= result.confidence <= 1, f"Confidence out of range for '{query}': {result.confidence}"
@@ -200,11 +165,9 @@ def test_confidence_scores_are_valid(resolver, classifier, planner):
 def test_get_article_by_url(resolver):
     """Test getting article by exact URL"""
     # Get a real article
-    articles = list(resolver.link_index._article_by_id.values())
-    if not articles:
+    test_article = next(iter(resolver.link_index._article_by_id.values()), None)
+    if test_article is None:
         pytest.skip("No articles in index")
-
-    test_article = articles[0]
     url = test_article.url
 
     # Should find the article
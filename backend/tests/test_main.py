@@ -0,0 +1,29 @@
+"""
+Tests for the FastAPI application
+"""
+
+import pytest
+from main import _etag_matches
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", W/"abc"', True),
+        ('"xyz",W/"abc" ', True),
+        ("*", True),
+        ('"xyz"', False),
+        ('"ab"', False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    """Test If-None-Match handling: weak validators, lists and wildcard"""
+    assert _etag_matches(if_none_match, '"abc"') is expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,42 +4,15 @@ Tests the complete RAG pipeline from query to response
 """
 
 import pytest
-from app.rag.pipeline import RAGPipeline
-from app.data.loaders import data_cache
-from app.data.content_index import ContentIndex
-from app.data.link_index import LinkIndex
-from app.models.llm_client import MockLLMClient
+import re
 from app.models.config import settings
 
-
-@pytest.fixture(scope="module")
-def pipeline():
-    """Create complete pipeline"""
-    # Load data
-    articles = data_cache.get_olj_articles()
-    recipes = data_cache.get_structured_recipes()
-
-    # Build indexes
-    content_index = ContentIndex()
-    content_index.add_olj_articles(articles)
-    content_index.add_structured_recipes(recipes)
-    content_index.build()
-
-    link_index = LinkIndex()
-    link_index.add_articles(articles)
-    link_index.build()
-
-    # Create pipeline with mock LLM
-    return RAGPipeline(
-        content_index=content_index,
-        link_index=link_index,
-        llm_client=MockLLMClient(),
-    )
+_URL_RE = re.compile(r'https?://[^\s<>"]+')
 
 
 def test_pipeline_greeting(pipeline):
     """Test pipeline with greeting"""
-    response = pipeline.process("Bonjour", debug=True)
+    response = pipeline.process("Bonjour", debug=False)
 
     assert response.html is not None
     assert "<p>" in response.html
@@ -50,7 +23,7 @@ def test_pipeline_greeting(pipeline):
 
 def test_pipeline_recipe_query(pipeline):
     """Test pipeline with recipe query"""
-    response = pipeline.process("Je veux la recette du hummus", debug=True)
+    response = pipeline.process("Je veux la recette du hummus", debug=False)
 
     assert response.html is not None
     assert "<p>" in response.html
@@ -61,7 +34,7 @@ def test_pipeline_recipe_query(pipeline):
 
 def test_pipeline_off_topic(pipeline):
     """Test pipeline with off-topic query"""
-    response = pipeline.process("Parle-moi de la politique française", debug=True)
+    response = pipeline.process("Parle-moi de la politique française", debug=False)
 
     assert response.html is not None
     # Should redirect to cooking or be detected as non-French
@@ -70,7 +43,7 @@ def test_pipeline_off_topic(pipeline):
 
 def test_pipeline_non_french(pipeline):
     """Test pipeline with non-French query"""
-    response = pipeline.process("Hello, how are you?", debug=True)
+    response = pipeline.process("Hello, how are you?", debug=False)
 
     assert response.html is not None
     assert response.scenario_id == 7  # Non-French
@@ -80,14 +53,14 @@ def test_pipeline_non_french(pipeline):
 
 def test_pipeline_ingredient_query(pipeline):
     """Test pipeline with ingredient query"""
-    response = pipeline.process("J'ai des pois chiches, que faire?", debug=True)
+    response = pipeline.process("J'ai des pois chiches, que faire?", debug=False)
 
     assert response.html is not None
     assert "<p>" in response.html
     # Should suggest something
 
 
-def test_pipeline_html_validity(pipeline):
+def test_pipeline_html_validity(process):
     """Test that all responses contain valid HTML"""
     queries = [
         "Bonjour",
@@ -97,7 +70,7 @@ def test_pipeline_html_validity(pipeline):
     ]
 
     for query in queries:
-        response = pipeline.process(query, debug=False)
+        response = process(query, debug=False)
 
         # Should have HTML tags
         assert "<p>" in response.html or "<a" in response.html
@@ -107,8 +80,9 @@ def test_pipeline_html_validity(pipeline):
         assert not response.html.startswith("#")
 
 
-def test_pipeline_url_safety(pipeline):
+def test_pipeline_url_safety(process):
     """Test that all URLs are from allowed domain"""
+    allowed = settings.allowed_url_domain
     queries = [
         "recette de hummus",
         "taboulé libanais",
@@ -116,17 +90,16 @@ def test_pipeline_url_safety(pipeline):
     ]
 
     for query in queries:
-        response = pipeline.process(query, debug=False)
+        response = process(query, debug=False)
 
         if response.primary_url:
-            assert response.primary_url.startswith(settings.allowed_url_domain), \
+            assert response.primary_url.startswith(allowed), \
                 f"Invalid URL for query '{query}': {response.primary_url}"
 
         # Check URLs in HTML
-        import re
-        urls = re.findall(r'https?://[^\s<>"]+', response.html)
+        urls = _URL_RE.findall(response.html)
         for url in urls:
-            assert url.startswith(settings.allowed_url_domain), \
+            assert url.startswith(allowed), \
                 f"Invalid URL in HTML for query '{query}': {url}"
 
 
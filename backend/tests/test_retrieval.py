@@ -3,33 +3,7 @@ Tests for Retriever and Reranker
 """
 
 import pytest
-from app.rag.retriever import Retriever
 from app.rag.reranker import Reranker
-from app.rag.classifier_agent import ClassifierAgent
-from app.rag.query_planner_agent import QueryPlannerAgent
-from app.data.loaders import data_cache
-from app.data.content_index import ContentIndex
-from app.models.llm_client import MockLLMClient
-
-
-@pytest.fixture(scope="module")
-def content_index():
-    """Create and build content index"""
-    articles = data_cache.get_olj_articles()
-    recipes = data_cache.get_structured_recipes()
-
-    index = ContentIndex()
-    index.add_olj_articles(articles)
-    index.add_structured_recipes(recipes)
-    index.build()
-
-    return index
-
-
-@pytest.fixture
-def retriever(content_index):
-    """Create retriever"""
-    return Retriever(content_index)
 
 
 @pytest.fixture
@@ -38,23 +12,10 @@ def reranker():
     return Reranker()
 
 
-@pytest.fixture
-def classifier():
-    """Create classifier"""
-    return ClassifierAgent(llm_client=MockLLMClient())
-
-
-@pytest.fixture
-def planner():
-    """Create planner"""
-    return QueryPlannerAgent()
-
-
-def test_retrieve_by_name(retriever, classifier, planner):
+def test_retrieve_by_name(retriever, classify_and_plan):
     """Test retrieval by recipe name"""
     query = "Je veux la recette du taboulé"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     candidates = retriever.retrieve(plan, top_k=5)
 
@@ -62,11 +23,10 @@ def test_retrieve_by_name(retriever, classifier, planner):
     assert all(c.score >= 0 for c in candidates), "All scores should be non-negative"
 
 
-def test_retrieve_by_ingredients(retriever, classifier, planner):
+def test_retrieve_by_ingredients(retriever, classify_and_plan):
     """Test retrieval by ingredients"""
     query = "J'ai des pois chiches et du tahini, que faire?"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     candidates = retriever.retrieve(plan, top_k=10)
 
@@ -81,22 +41,147 @@ def test_retrieve_by_ingredients(retriever, classifier, planner):
         pytest.skip("No candidates found for this ingredient combination")
 
 
-def test_retrieve_greeting_returns_empty(retriever, classifier, planner):
+def test_retrieve_greeting_returns_empty(retriever, classify_and_plan):
     """Test that greeting queries don't retrieve anything"""
     query = "Bonjour"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     candidates = retriever.retrieve(plan, top_k=5)
 
     assert len(candidates) == 0, "Greetings should not retrieve content"
 
 
-def test_rerank_improves_ordering(retriever, reranker, classifier, planner):
+def test_retrieve_blank_query_returns_empty(retriever):
+    """Test that a plan with nothing to search for skips retrieval"""
+    from app.models.schemas import QueryPlan
+
+    plan = QueryPlan(
+        need_type="suggestions",
+        primary_dish=None,
+        ingredients=[],
+        constraints=[],
+        language="fr",
+        retrieval_query="  ",
+        link_query=None,
+    )
+
+    assert retriever.retrieve(plan, top_k=5) == []
+
+
+def test_retrieve_nonsense_ingredients_returns_empty(retriever):
+    """Test that documents matching none of the ingredients get no rank credit"""
+    from app.models.schemas import QueryPlan
+
+    plan = QueryPlan(
+        need_type="recipe_by_ingredients",
+        primary_dish=None,
+        ingredients=["xyzzy", "plugh"],
+        constraints=[],
+        language="fr",
+        retrieval_query="xyzzy plugh",
+        link_query=None,
+    )
+
+    assert retriever.retrieve(plan, top_k=5) == []
+
+
+@pytest.mark.parametrize(
+    "ingredients, first_source",
+    [(["courgette", "boeuf"], "olj"), (["poulet", "tomate"], "base2")],
+    ids=["no_base2_match", "base2_match"],
+)
+def test_retrieve_by_ingredients_source_mix(retriever, ingredients, first_source):
+    """Test that only Base 2 recipes sharing an ingredient can outrank OLJ articles"""
+    from app.models.schemas import QueryPlan
+
+    plan = QueryPlan(
+        need_type="recipe_by_ingredients",
+        primary_dish=None,
+        ingredients=ingredients,
+        constraints=[],
+        language="fr",
+        retrieval_query=" ".join(ingredients),
+        link_query=None,
+    )
+
+    candidates = retriever.retrieve(plan, top_k=10)
+
+    assert candidates[0].source == first_source
+    assert any(c.source == "olj" for c in candidates)
+    for candidate in candidates:
+        if candidate.source == "base2":
+            assert any(i in name for i in ingredients for name in candidate.ingredient_set)
+
+
+def test_retrieve_by_ingredients_keeps_raw_score(retriever):
+    """Test that fused ingredient candidates carry their raw similarity"""
+    from app.models.schemas import QueryPlan
+
+    plan = QueryPlan(
+        need_type="recipe_by_ingredients",
+        primary_dish=None,
+        ingredients=["poulet", "tomate"],
+        constraints=[],
+        language="fr",
+        retrieval_query="poulet tomate",
+        link_query=None,
+    )
+
+    candidates = retriever.retrieve(plan, top_k=5)
+
+    assert candidates
+    assert all(c.raw_score is not None and c.raw_score > 0 for c in candidates)
+    assert all(c.relevance == c.raw_score for c in candidates)
+
+
+def test_retrieve_by_name_ties_keep_index_order():
+    """Test that tied scores keep the index's order through top-k selection"""
+    from app.models.schemas import ContentDocument, QueryPlan
+    from app.rag.retriever import Retriever
+
+    docs = [
+        ContentDocument(doc_id=f"d{i}", source="base2", content=f"plat {i}", recipe_id=f"r{i}")
+        for i in range(8)
+    ]
+
+    class TiedIndex:
+        def search(self, query, top_k, source_filter):
+            return [(doc, 0.5) for doc in docs[:top_k]]
+
+    plan = QueryPlan(
+        need_type="recipe_by_name",
+        primary_dish=None,
+        ingredients=[],
+        constraints=[],
+        language="fr",
+        retrieval_query="plat",
+        link_query=None,
+    )
+
+    candidates = Retriever(TiedIndex())._retrieve_by_name(plan, top_k=3)
+
+    assert [c.recipe_id for c in candidates] == ["r0", "r1", "r2"]
+
+
+def test_retrieve_cache_isolates_results(retriever, reranker, classify_and_plan):
+    """Test that repeated queries hit the cache and reranking leaves it untouched"""
+    query = "recette de hummus libanais"
+    classification, plan = classify_and_plan(query)
+
+    first = retriever.retrieve(plan, top_k=10)
+    first_scores = [c.score for c in first]
+    reranker.rerank(first, plan, top_k=5)
+
+    second = retriever.retrieve(plan, top_k=10)
+
+    assert [c.score for c in first] == first_scores
+    assert [c.score for c in second] == first_scores
+
+
+def test_rerank_improves_ordering(retriever, reranker, classify_and_plan):
     """Test that reranking improves result ordering"""
     query = "recette de hummus libanais"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     candidates = retriever.retrieve(plan, top_k=10)
     assert len(candidates) > 0
@@ -110,11 +195,10 @@ def test_rerank_improves_ordering(retriever, reranker, classifier, planner):
     assert scores == sorted(scores, reverse=True), "Reranked results should be sorted by score"
 
 
-def test_rerank_lebanese_boost(reranker, retriever, classifier, planner):
+def test_rerank_lebanese_boost(reranker, retriever, classify_and_plan):
     """Test that Lebanese dishes get boosted in reranking"""
     query = "mezze libanais"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     candidates = retriever.retrieve(plan, top_k=10)
     if not candidates:
@@ -128,11 +212,10 @@ def test_rerank_lebanese_boost(reranker, retriever, classifier, planner):
         # Lebanese content should rank high (but not strictly required for all)
 
 
-def test_rerank_ingredient_match(reranker, retriever, classifier, planner):
+def test_rerank_ingredient_match(reranker, retriever, classify_and_plan):
     """Test ingredient matching in reranking"""
     query = "J'ai des aubergines et du tahini"
-    classification = classifier.classify(query)
-    plan = planner.plan(classification, query)
+    classification, plan = classify_and_plan(query)
 
     candidates = retriever.retrieve(plan, top_k=10)
     if not candidates:
@@ -179,6 +262,39 @@ def test_deduplicate_removes_duplicates(reranker):
     deduped = reranker.deduplicate(candidates)
 
     assert len(deduped) == 2, "Should remove duplicate article"
+    assert deduped[0].score == 0.9, "Should keep the highest-scoring duplicate"
+    scores = [c.score for c in deduped]
+    assert scores == sorted(scores, reverse=True), "Deduplicated results should be sorted by score"
+
+
+def test_rerank_and_deduplicate_keep_same_duplicate(reranker):
+    """Test rerank and deduplicate collapse duplicates to the same best-scoring copy"""
+    from app.models.schemas import QueryPlan, RetrievalCandidate
+
+    plan = QueryPlan(
+        need_type="suggestions",
+        primary_dish=None,
+        ingredients=[],
+        constraints=[],
+        language="fr",
+        retrieval_query="mezze",
+        link_query=None,
+    )
+    # The later copy scores higher: it carries the Lebanese boost
+    candidates = [
+        RetrievalCandidate(source="olj", content="salade", score=0.5, article_id="a1"),
+        RetrievalCandidate(source="olj", content="salade libanaise", score=0.5, article_id="a1"),
+        RetrievalCandidate(source="base2", content="soupe", score=0.4, recipe_id="r1"),
+    ]
+
+    reranked = reranker.rerank(candidates, plan, top_k=5)
+    deduped = reranker.deduplicate(reranked)
+
+    assert [c.content for c in reranked] == ["salade libanaise", "soupe"]
+    assert deduped == reranked
+    assert [c.content for c in reranker.deduplicate(candidates)] == ["salade", "soupe"], (
+        "Equal scores keep the first copy"
+    )
 
 
 def test_diversify_balances_sources(reranker):
@@ -228,6 +344,8 @@ def test_filter_by_constraints(retriever):
 
     # First candidate should rank higher (matches constraints)
     assert filtered[0].content == "recette végétarienne rapide"
+    # Input candidates keep their original scores
+    assert [c.score for c in candidates] == [0.8, 0.9]
 
 
 if __name__ == "__main__":